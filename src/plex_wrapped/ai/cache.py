@@ -0,0 +1,59 @@
+# ABOUTME: Disk-backed cache for parsed LLM generator responses.
+# ABOUTME: Identical generator/prompt/stats/model inputs skip the provider call on re-runs.
+
+import hashlib
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+
+class ResponseCache:
+    """Stores parsed generator output as one JSON file per cache key."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cached responses (created on first write)
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a stable cache key from the inputs that determine a response.
+
+        Args:
+            parts: Strings that together identify a request (generator, prompt, stats, model)
+
+        Returns:
+            Hex SHA-256 digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the cached response for a key, or None on a miss.
+
+        Unreadable or corrupt entries are treated as misses.
+        """
+        path = self.cache_dir / f"{key}.json"
+        try:
+            return orjson.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store a response under a key.
+
+        Writes go through a temporary file so an interrupted run never leaves
+        a half-written entry behind.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(value))
+        tmp_path.replace(path)
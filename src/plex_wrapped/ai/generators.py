@@ -1,39 +1,243 @@
 # ABOUTME: AI content generators for Plex Wrapped.
 # ABOUTME: Creates narratives, personalities, roasts, and other insights from user stats.
 
-import json
+import copy
 import re
-from abc import ABC, abstractmethod
-from typing import Any
+from abc import ABC
+from typing import Any, ClassVar, Optional
 
+import orjson
+
+from plex_wrapped.ai.cache import ResponseCache
 from plex_wrapped.ai.provider import LLMProvider
 
+# Stats keys that carry no signal for the LLM and only cost input tokens
+_PROMPT_EXCLUDED_KEYS = frozenset({"image_url"})
+
+# A complete JSON string literal, honouring backslash escapes (unrolled so the
+# common run of plain characters is consumed in one step)
+_JSON_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+def _compact_stats(value: Any) -> Any:
+    """Strip prompt-irrelevant keys and round floats to keep the payload small."""
+    if isinstance(value, dict):
+        return {
+            key: _compact_stats(item)
+            for key, item in value.items()
+            if key not in _PROMPT_EXCLUDED_KEYS
+        }
+    if isinstance(value, list):
+        return [_compact_stats(item) for item in value]
+    if isinstance(value, float):
+        return round(value, 1)
+    return value
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """Find the first balanced top-level JSON object in text.
+
+    Tracks brace depth outside of string literals, so nested objects and braces
+    inside strings are handled and any prose or fences around the object are ignored.
+
+    Args:
+        text: Text that may contain a JSON object
+
+    Returns:
+        The object's source text, or None if no balanced object is found
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape_next = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape_next:
+                escape_next = False
+            elif char == "\\":
+                escape_next = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
+def _truncated_object_prefixes(text: str) -> list[str]:
+    """Close a truncated top-level JSON object after each of its complete members.
+
+    A comma directly inside the outermost object (outside strings, nested objects
+    and arrays) always follows a complete member, so cutting there and appending
+    a brace yields the members that fully arrived.
+
+    Args:
+        text: Text holding an object whose closing brace never arrived
+
+    Returns:
+        Candidate objects, keeping the most members first
+    """
+    start = text.find("{")
+    if start == -1:
+        return []
+
+    cuts: list[int] = []
+    depth = 0
+    in_string = False
+    escape_next = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape_next:
+                escape_next = False
+            elif char == "\\":
+                escape_next = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                # The object did close, so it isn't truncated
+                return []
+        elif char == "," and depth == 1:
+            cuts.append(i)
+    return [text[start:cut] + "}" for cut in reversed(cuts)]
+
+
+def _escape_string_newlines(match: re.Match[str]) -> str:
+    """Escape raw newlines in one matched JSON string literal."""
+    return match.group().replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _escape_newlines_in_strings(text: str) -> str:
+    """Escape literal newlines that appear inside JSON string values."""
+    if "\n" not in text and "\r" not in text:
+        return text
+    return _JSON_STRING_RE.sub(_escape_string_newlines, text)
 
-class BaseGenerator(ABC):
-    """Base class for all AI content generators."""
 
-    def __init__(self, provider: LLMProvider) -> None:
+class BaseGenerator(ABC):
+    """Base class for all AI content generators.
+
+    Subclasses only declare their instructions and fallback content. The
+    instructions are sent as a static system prompt so they stay byte-identical
+    across users and can be served from the provider's prompt cache; only the
+    stats JSON varies per request.
+    """
+
+    SYSTEM_PROMPT: ClassVar[str] = ""
+    DEFAULT: ClassVar[dict[str, Any]] = {}
+    # Top-level stats keys this generator needs; None sends everything
+    STATS_FIELDS: ClassVar[Optional[frozenset[str]]] = None
+    MAX_TOKENS: ClassVar[int] = 1024
+    # Static lead-in for the user message; only the stats JSON after it varies
+    USER_MESSAGE_PREFIX: ClassVar[str] = "User Stats:\n"
+
+    def __init__(self, provider: LLMProvider, cache: Optional[ResponseCache] = None) -> None:
         self.provider = provider
+        self.cache = cache
 
-    @abstractmethod
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate content from user stats."""
-        pass
+    async def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
+        """Generate content from user stats.
+
+        When a response cache is configured, identical stats for the same
+        generator, instructions, and model are served from disk without calling
+        the provider. Fallback defaults and incomplete responses are never cached.
+        """
+        user_message = self._build_user_message(stats)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(
+                type(self).__name__,
+                self.SYSTEM_PROMPT,
+                user_message,
+                self.provider.model,
+                repr(self.provider.temperature),
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        response = await self.provider.generate(
+            user_message, system=self.SYSTEM_PROMPT, max_tokens=self.MAX_TOKENS, json_output=True
+        )
+        default = copy.deepcopy(self.DEFAULT)
+        result, salvaged = self._parse_json_response(response, default)
+
+        if (
+            cache_key is not None
+            and result is not default
+            and not salvaged
+            and self._is_complete(result)
+        ):
+            self.cache.set(cache_key, result)
+        return result
+
+    def _is_complete(self, result: Any) -> bool:
+        """Whether a parsed response is whole enough to be cached."""
+        return isinstance(result, dict)
+
+    def _build_user_message(self, stats: dict[str, Any]) -> str:
+        """Build the per-user message carrying the stats payload.
+
+        Only the fields listed in STATS_FIELDS are sent, serialized without
+        whitespace or ASCII escapes, since every byte here is billed as input tokens.
+        """
+        if self.STATS_FIELDS is not None:
+            stats = {key: value for key, value in stats.items() if key in self.STATS_FIELDS}
+        payload = orjson.dumps(_compact_stats(stats), option=orjson.OPT_NON_STR_KEYS)
+        return self.USER_MESSAGE_PREFIX + payload.decode()
 
     def _parse_json(self, response: str, default: dict[str, Any] | None = None) -> dict[str, Any]:
         """Parse JSON response from LLM with defensive error handling.
 
+        See _parse_json_response for the recovery steps.
+
+        Args:
+            response: Raw LLM response string
+            default: Default value to return on parse failure
+
+        Returns:
+            Parsed JSON dict or default value
+        """
+        return self._parse_json_response(response, default)[0]
+
+    def _parse_json_response(
+        self, response: str, default: dict[str, Any] | None = None
+    ) -> tuple[dict[str, Any], bool]:
+        """Parse JSON response from LLM, noting whether it had to be salvaged.
+
         Handles common LLM JSON issues:
         - Markdown code blocks
+        - Prose before or after the object
         - Unescaped newlines in strings
         - Truncated responses
 
+        A truncated response is cut back to its complete top-level members, and
+        only kept if it shares keys with the default, so an inner object is never
+        mistaken for the whole reply.
+
         Args:
             response: Raw LLM response string
             default: Default value to return on parse failure
 
         Returns:
-            Parsed JSON dict or default value
+            Tuple of (parsed JSON dict or default value, whether it was salvaged
+            from a truncated response)
         """
         if default is None:
             default = {}
@@ -53,63 +257,47 @@ class BaseGenerator(ABC):
 
         # Try direct parse first
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response), False
+        except orjson.JSONDecodeError:
             pass
 
-        # Try to fix common issues
-
-        # Fix unescaped newlines inside string values
-        # This regex finds string values and escapes literal newlines
-        def escape_newlines_in_strings(text: str) -> str:
-            result = []
-            in_string = False
-            escape_next = False
-            for char in text:
-                if escape_next:
-                    result.append(char)
-                    escape_next = False
-                elif char == '\\':
-                    result.append(char)
-                    escape_next = True
-                elif char == '"':
-                    result.append(char)
-                    in_string = not in_string
-                elif char == '\n' and in_string:
-                    result.append('\\n')
-                elif char == '\r' and in_string:
-                    result.append('\\r')
-                else:
-                    result.append(char)
-            return ''.join(result)
-
+        # Pull the first balanced object out of any surrounding prose
+        candidate = _extract_json_object(response) or response
         try:
-            fixed = escape_newlines_in_strings(response)
-            return json.loads(fixed)
-        except json.JSONDecodeError:
-            pass
-
-        # Try to find and extract JSON object from response
-        match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-        if match:
+            return orjson.loads(candidate), False
+        except orjson.JSONDecodeError as e:
+            error_pos = e.pos
+
+        # A raw line break inside a string is fixable. The decoder has validated
+        # everything before it, so only the rest is escaped; the leading quote
+        # resumes the scan inside the string the break belongs to.
+        if candidate[error_pos:error_pos + 1] in ("\n", "\r"):
+            tail = _escape_newlines_in_strings('"' + candidate[error_pos:])[1:]
             try:
-                return json.loads(match.group())
-            except json.JSONDecodeError:
+                return orjson.loads(candidate[:error_pos] + tail), False
+            except orjson.JSONDecodeError:
                 pass
 
+        # Last resort for truncated responses: the members that fully arrived,
+        # provided they are the keys this generator expects
+        for prefix in _truncated_object_prefixes(response):
+            try:
+                salvaged = orjson.loads(prefix)
+            except orjson.JSONDecodeError:
+                continue
+            if not default or salvaged.keys() & default.keys():
+                return salvaged, True
+            break
+
         # Return default if all else fails
-        return default
+        return default, False
 
 
 class NarrativeGenerator(BaseGenerator):
     """Generates a narrative story of the user's year in music."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate narrative from user stats."""
-        prompt = f"""You are writing a Last.fm Wrapped narrative for a user's 2024 listening year.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are writing a Last.fm Wrapped narrative for a user's 2024 listening year.
+The user's stats are provided as JSON in the user message.
 
 Create a playful, humorous narrative that tells the story of their year through music.
 Make it personal, fun, and slightly irreverent - like Spotify Wrapped but with more personality.
@@ -118,188 +306,167 @@ IMPORTANT: Return ONLY valid JSON. The narrative text should be plain text with
 Keep paragraphs separated with \\n\\n for readability.
 
 Return in this exact format:
-{{
+{
     "narrative": "Your 2024 musical journey was..."
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {"narrative": "Your musical journey was too epic to put into words."})
+    DEFAULT = {"narrative": "Your musical journey was too epic to put into words."}
 
 
 class PersonalityGenerator(BaseGenerator):
     """Generates a music personality type based on listening habits."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate personality type from user stats."""
-        prompt = f"""You are creating a music personality type for a Last.fm user based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating a music personality type for a Last.fm user based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create a funny, creative personality type that captures their listening patterns. Think Myers-Briggs meets music taste.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "type": "The Chaos Agent",
     "tagline": "Your playlists have trust issues",
     "description": "You listen to everything...",
     "spirit_animal": "A caffeinated raccoon"
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "type": "The Mystery Listener",
-            "tagline": "Your taste defies classification",
-            "description": "We couldn't quite figure you out, but that's probably a compliment.",
-            "spirit_animal": "A sphinx"
-        })
+    STATS_FIELDS = frozenset({"total", "top_artists", "top_tracks", "time_analysis"})
+
+    DEFAULT = {
+        "type": "The Mystery Listener",
+        "tagline": "Your taste defies classification",
+        "description": "We couldn't quite figure you out, but that's probably a compliment.",
+        "spirit_animal": "A sphinx"
+    }
 
 
 class RoastGenerator(BaseGenerator):
     """Generates playful roasts based on listening habits."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate roasts from user stats."""
-        prompt = f"""You are creating playful roasts for a Last.fm user based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating playful roasts for a Last.fm user based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create 3-5 funny, light-hearted roasts about their music taste or listening patterns.
 Keep it fun and not mean-spirited - like friendly banter.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "roasts": [
         "Your 2am listening habits are concerning",
         "Another roast here..."
     ]
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "roasts": ["Your music taste is so unique, we couldn't even roast it properly."]
-        })
+    STATS_FIELDS = frozenset({"total", "top_artists", "top_tracks", "time_analysis"})
+
+    DEFAULT = {
+        "roasts": ["Your music taste is so unique, we couldn't even roast it properly."]
+    }
 
 
 class AuraGenerator(BaseGenerator):
     """Generates a music aura color and description."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate aura from user stats."""
-        prompt = f"""You are creating a "music aura" for a Last.fm user based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating a "music aura" for a Last.fm user based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create a creative aura color and vibe that represents their musical energy. Think astrology but for music taste.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "color": "Midnight Purple",
     "hex": "#9B59B6",
     "vibe": "Mysterious and moody",
     "description": "Your aura radiates..."
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "color": "Cosmic Purple",
-            "hex": "#9B59B6",
-            "vibe": "Enigmatic and eclectic",
-            "description": "Your musical energy transcends simple description."
-        })
+    STATS_FIELDS = frozenset({"total", "top_artists", "top_tracks"})
+
+    DEFAULT = {
+        "color": "Cosmic Purple",
+        "hex": "#9B59B6",
+        "vibe": "Enigmatic and eclectic",
+        "description": "Your musical energy transcends simple description."
+    }
 
 
 class SuperlativesGenerator(BaseGenerator):
     """Generates fun superlatives and awards."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate superlatives from user stats."""
-        prompt = f"""You are creating music superlatives/awards for a Last.fm user based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating music superlatives/awards for a Last.fm user based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create 3-5 funny, creative awards like "Most Likely To..." or "Best..." based on their listening patterns.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "superlatives": [
-        {{
+        {
             "award": "Most Dedicated Fan",
             "reason": "Played the same song 200 times"
-        }}
+        }
     ]
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "superlatives": [
-                {"award": "Most Dedicated Listener", "reason": "You showed up for your music"}
-            ]
-        })
+    DEFAULT = {
+        "superlatives": [
+            {"award": "Most Dedicated Listener", "reason": "You showed up for your music"}
+        ]
+    }
 
 
 class HotTakesGenerator(BaseGenerator):
     """Generates spicy hot takes about the user's music taste."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate hot takes from user stats."""
-        prompt = f"""You are creating "hot takes" about a Last.fm user's music taste based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating "hot takes" about a Last.fm user's music taste based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create 3-5 bold, funny opinions or observations about their music taste.
 Make them slightly controversial but playful.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "hot_takes": [
         "You say you like indie, but your top 10 is basically the radio",
         "Another hot take..."
     ]
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "hot_takes": ["Your music taste is impeccable and we have no notes."]
-        })
+    STATS_FIELDS = frozenset({"total", "top_artists", "top_tracks", "top_albums"})
+
+    DEFAULT = {
+        "hot_takes": ["Your music taste is impeccable and we have no notes."]
+    }
 
 
 class SuggestionsGenerator(BaseGenerator):
     """Generates personalized music suggestions and predictions."""
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate suggestions from user stats."""
-        prompt = f"""You are creating personalized music suggestions for a Last.fm user based on their 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = """You are creating personalized music suggestions for a Last.fm user based on their 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Create 3-5 recommendations or predictions about what they should listen to next, or what their 2025 might look like.
 Make them fun and personalized.
 
 Return ONLY valid JSON in this format:
-{{
+{
     "suggestions": [
         "Based on your late-night listening, try: Artist Name",
         "Another suggestion..."
     ]
-}}
+}
 """
 
-        response = self.provider.generate(prompt)
-        return self._parse_json(response, {
-            "suggestions": ["Keep doing what you're doing - your taste is already excellent."]
-        })
+    STATS_FIELDS = frozenset({"top_artists", "top_tracks", "top_albums"})
+
+    DEFAULT = {
+        "suggestions": ["Keep doing what you're doing - your taste is already excellent."]
+    }
 
 
 class ThemeGenerator(BaseGenerator):
@@ -316,20 +483,13 @@ class ThemeGenerator(BaseGenerator):
         "quirkyStats", "personality", "aura", "roasts", "narrative", "share"
     ]
 
-    def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
-        """Generate theme from user stats."""
-        viz_info = json.dumps(self.AVAILABLE_VISUALIZATIONS, indent=2)
-        slides_list = json.dumps(self.SLIDES)
-
-        prompt = f"""You are creating a visual theme for a Last.fm Wrapped experience based on the user's 2024 listening habits.
-
-User Stats:
-{json.dumps(stats, indent=2)}
+    SYSTEM_PROMPT = f"""You are creating a visual theme for a Last.fm Wrapped experience based on the user's 2024 listening habits.
+The user's stats are provided as JSON in the user message.
 
 Available Visualizations:
-{viz_info}
+{orjson.dumps(AVAILABLE_VISUALIZATIONS).decode()}
 
-Slides to configure: {slides_list}
+Slides to configure: {orjson.dumps(SLIDES).decode()}
 
 Based on the user's music taste and personality, create:
 1. A color palette (5 colors) that reflects their musical vibe
@@ -362,27 +522,82 @@ Return ONLY valid JSON in this format:
 }}
 """
 
-        response = self.provider.generate(prompt)
-        default_theme = {
-            "palette": {
-                "primary": "#6366F1",
-                "secondary": "#8B5CF6",
-                "accent": "#EC4899",
-                "background": "#0F172A",
-                "text": "#FFFFFF"
-            },
-            "slides": {
-                "intro": {"visualization": "aurora", "mood": "dramatic", "intensity": 0.8},
-                "totalTime": {"visualization": "particles", "mood": "celebratory", "intensity": 0.6},
-                "topArtist": {"visualization": "gradient_blob", "mood": "warm", "intensity": 0.7},
-                "topTracks": {"visualization": "particles", "mood": "energetic", "intensity": 0.5},
-                "listeningClock": {"visualization": "aurora", "mood": "analytical", "intensity": 0.4},
-                "quirkyStats": {"visualization": "particles", "mood": "playful", "intensity": 0.6},
-                "personality": {"visualization": "gradient_blob", "mood": "introspective", "intensity": 0.7},
-                "aura": {"visualization": "aurora", "mood": "mystical", "intensity": 0.9},
-                "roasts": {"visualization": "particles", "mood": "chaotic", "intensity": 0.8},
-                "narrative": {"visualization": "gradient_blob", "mood": "reflective", "intensity": 0.3},
-                "share": {"visualization": "aurora", "mood": "triumphant", "intensity": 0.7}
-            }
+    STATS_FIELDS = frozenset({"top_artists", "top_tracks", "time_analysis"})
+
+    DEFAULT = {
+        "palette": {
+            "primary": "#6366F1",
+            "secondary": "#8B5CF6",
+            "accent": "#EC4899",
+            "background": "#0F172A",
+            "text": "#FFFFFF"
+        },
+        "slides": {
+            "intro": {"visualization": "aurora", "mood": "dramatic", "intensity": 0.8},
+            "totalTime": {"visualization": "particles", "mood": "celebratory", "intensity": 0.6},
+            "topArtist": {"visualization": "gradient_blob", "mood": "warm", "intensity": 0.7},
+            "topTracks": {"visualization": "particles", "mood": "energetic", "intensity": 0.5},
+            "listeningClock": {"visualization": "aurora", "mood": "analytical", "intensity": 0.4},
+            "quirkyStats": {"visualization": "particles", "mood": "playful", "intensity": 0.6},
+            "personality": {"visualization": "gradient_blob", "mood": "introspective", "intensity": 0.7},
+            "aura": {"visualization": "aurora", "mood": "mystical", "intensity": 0.9},
+            "roasts": {"visualization": "particles", "mood": "chaotic", "intensity": 0.8},
+            "narrative": {"visualization": "gradient_blob", "mood": "reflective", "intensity": 0.3},
+            "share": {"visualization": "aurora", "mood": "triumphant", "intensity": 0.7}
+        }
+    }
+
+
+class CompositeGenerator(BaseGenerator):
+    """Generates all text sections in a single request.
+
+    Combines the instructions of the per-section generators into one prompt that
+    returns a JSON object keyed by section name, so each user costs one round
+    trip and one copy of the stats instead of one per section. Sections missing
+    from the response fall back to that generator's default.
+    """
+
+    SECTIONS: ClassVar[dict[str, type[BaseGenerator]]] = {
+        "narrative": NarrativeGenerator,
+        "personality": PersonalityGenerator,
+        "roast": RoastGenerator,
+        "aura": AuraGenerator,
+        "superlatives": SuperlativesGenerator,
+        "hot_takes": HotTakesGenerator,
+        "suggestions": SuggestionsGenerator,
+    }
+
+    SYSTEM_PROMPT = (
+        "You are creating several sections of a Last.fm Wrapped experience "
+        "based on a user's 2024 listening habits.\n"
+        "The user's stats are provided as JSON in the user message.\n\n"
+        "Complete every task below. Return ONLY valid JSON: a single object whose "
+        f"top-level keys are {orjson.dumps(list(SECTIONS)).decode()}, each holding the object "
+        "described by that task.\n\n"
+        + "\n".join(
+            f'=== Task for key "{name}" ===\n{generator.SYSTEM_PROMPT}'
+            for name, generator in SECTIONS.items()
+        )
+    )
+
+    DEFAULT = {name: generator.DEFAULT for name, generator in SECTIONS.items()}
+    MAX_TOKENS = 4096
+
+    async def generate(self, stats: dict[str, Any]) -> dict[str, Any]:
+        """Generate every section from user stats."""
+        result = await super().generate(stats)
+        # A reply that parsed to a list or scalar leaves every section on its default
+        if not isinstance(result, dict):
+            result = {}
+        return {
+            name: result[name]
+            if isinstance(result.get(name), dict)
+            else copy.deepcopy(generator.DEFAULT)
+            for name, generator in self.SECTIONS.items()
         }
-        return self._parse_json(response, default_theme)
+
+    def _is_complete(self, result: Any) -> bool:
+        """Only cache replies carrying every section, so a truncated one isn't pinned."""
+        return isinstance(result, dict) and all(
+            isinstance(result.get(name), dict) for name in self.SECTIONS
+        )
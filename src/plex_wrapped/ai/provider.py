@@ -1,23 +1,111 @@
 # ABOUTME: Abstract LLM provider interface with concrete implementations.
 # ABOUTME: Factory pattern for creating provider instances based on config.
 
+import logging
+import re
 from abc import ABC, abstractmethod
+from typing import Any, Optional
 
 from plex_wrapped.config import LLMConfig
 
+logger = logging.getLogger(__name__)
+
+# Characters that can change JSON nesting or string state
+_JSON_SPECIAL_RE = re.compile(r'[{}"\\]')
+
+
+def _log_cache_usage(usage: Any) -> None:
+    """Log how much of a request's input was read from or written to the prompt cache."""
+    logger.debug(
+        "Prompt cache: %s input tokens read, %s written",
+        getattr(usage, "cache_read_input_tokens", None),
+        getattr(usage, "cache_creation_input_tokens", None),
+    )
+
+
+class RateLimitError(Exception):
+    """Raised when a provider rejects a request for exceeding its rate limits."""
+
+
+class _JsonObjectScanner:
+    """Finds where the first top-level JSON object in streamed text ends.
+
+    Text before the first brace is skipped, and braces inside string literals
+    don't count, matching how the generators extract objects from responses.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape_next = False
+
+    def feed(self, text: str) -> Optional[int]:
+        """Scan the next chunk of the stream.
+
+        Args:
+            text: Chunk following everything fed so far
+
+        Returns:
+            Index in text just past the object's closing brace, or None if the
+            object hasn't closed yet
+        """
+        # Position of a character escaped by a preceding backslash
+        skip = 0 if self.escape_next else -1
+        self.escape_next = False
+        for match in _JSON_SPECIAL_RE.finditer(text):
+            i = match.start()
+            if i == skip:
+                continue
+            char = match.group()
+            if self.in_string:
+                if char == "\\":
+                    skip = i + 1
+                    self.escape_next = skip == len(text)
+                elif char == '"':
+                    self.in_string = False
+            elif char == "{":
+                self.depth += 1
+            elif self.depth == 0:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return None
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    model: str = ""
+    temperature: float = 0.0
+
     @abstractmethod
-    def generate(self, prompt: str) -> str:
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
         """Generate content from a prompt.
 
         Args:
             prompt: The prompt to send to the LLM.
+            system: Optional static instructions sent ahead of the prompt.
+                Providers that support prompt caching mark this block as cacheable,
+                so it must not contain per-request data.
+            max_tokens: Upper bound on generated tokens.
+            json_output: Whether the caller expects a JSON object back. Providers
+                with a JSON mode use it to guarantee parseable output.
 
         Returns:
             Generated text content.
+
+        Raises:
+            RateLimitError: If the provider rejects the request for rate limiting.
         """
         pass
 
@@ -25,11 +113,20 @@ class LLMProvider(ABC):
 class NoOpProvider(LLMProvider):
     """Provider that returns empty strings for AI-free mode."""
 
-    def generate(self, prompt: str) -> str:
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
         """Return empty string without calling any LLM.
 
         Args:
             prompt: The prompt (ignored).
+            system: The system instructions (ignored).
+            max_tokens: Token limit (ignored).
+            json_output: JSON mode flag (ignored).
 
         Returns:
             Empty string.
@@ -40,63 +137,139 @@ class NoOpProvider(LLMProvider):
 class AnthropicProvider(LLMProvider):
     """Provider for Anthropic's Claude API."""
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-5-20250929") -> None:
+    def __init__(
+        self, api_key: str, model: str = "claude-sonnet-4-5-20250929", temperature: float = 0.0
+    ) -> None:
         """Initialize Anthropic provider.
 
         Args:
             api_key: Anthropic API key.
             model: Model ID to use.
+            temperature: Sampling temperature; 0 keeps output deterministic and cacheable.
         """
         import anthropic
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        self._rate_limit_error = anthropic.RateLimitError
         self.model = model
-
-    def generate(self, prompt: str) -> str:
+        self.temperature = temperature
+
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
         """Generate content using Anthropic API.
 
+        The system block is marked with an ephemeral cache_control so repeated
+        requests sharing the same instructions are billed at the cached rate.
+
         Args:
             prompt: The prompt to send to Claude.
+            system: Optional static instructions, sent as a cached system block.
+            max_tokens: Upper bound on generated tokens.
+            json_output: Stream the response and stop as soon as the first JSON
+                object closes, so trailing commentary isn't waited for (or billed).
 
         Returns:
             Generated text content.
         """
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        kwargs: dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": self.temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            kwargs["system"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
+        try:
+            if json_output:
+                return await self._generate_json(kwargs)
+            message = await self.client.messages.create(**kwargs)
+        except self._rate_limit_error as e:
+            raise RateLimitError(str(e)) from e
+        _log_cache_usage(message.usage)
         return message.content[0].text
 
+    async def _generate_json(self, kwargs: dict[str, Any]) -> str:
+        """Stream a response up to the end of its first JSON object."""
+        scanner = _JsonObjectScanner()
+        parts: list[str] = []
+        # Leaving the stream early closes the connection, which ends generation
+        async with self.client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                end = scanner.feed(text)
+                if end is not None:
+                    parts.append(text[:end])
+                    break
+                parts.append(text)
+            # Input and cache usage arrive with message_start, so the snapshot
+            # has them even when the stream is left early
+            _log_cache_usage(stream.current_message_snapshot.usage)
+        return "".join(parts)
+
 
 class OpenAIProvider(LLMProvider):
     """Provider for OpenAI's GPT API."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o") -> None:
+    def __init__(
+        self, api_key: str, model: str = "gpt-4o", temperature: float = 0.0
+    ) -> None:
         """Initialize OpenAI provider.
 
         Args:
             api_key: OpenAI API key.
             model: Model ID to use.
+            temperature: Sampling temperature; 0 keeps output deterministic and cacheable.
         """
         import openai
 
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(api_key=api_key)
+        self._rate_limit_error = openai.RateLimitError
         self.model = model
-
-    def generate(self, prompt: str) -> str:
+        self.temperature = temperature
+
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
         """Generate content using OpenAI API.
 
+        OpenAI caches shared prompt prefixes automatically, so the static
+        system message is sent first to keep the prefix stable.
+
         Args:
             prompt: The prompt to send to GPT.
+            system: Optional static instructions, sent as a system message.
+            max_tokens: Upper bound on generated tokens.
+            json_output: Request JSON mode so the response is always a valid object.
 
         Returns:
             Generated text content.
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        kwargs: dict[str, Any] = {}
+        if json_output:
+            kwargs["response_format"] = {"type": "json_object"}
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_completion_tokens=max_tokens,
+                temperature=self.temperature,
+                **kwargs,
+            )
+        except self._rate_limit_error as e:
+            raise RateLimitError(str(e)) from e
         return response.choices[0].message.content or ""
 
 
@@ -112,19 +285,19 @@ def get_provider(config: LLMConfig) -> LLMProvider:
     Raises:
         ValueError: If provider type is unsupported.
     """
+    kwargs: dict[str, Any] = {"temperature": config.temperature}
+    if config.model:
+        kwargs["model"] = config.model
+
     if config.provider == "none":
         return NoOpProvider()
     elif config.provider == "anthropic":
         if not config.api_key:
             raise ValueError("Anthropic API key required")
-        if config.model:
-            return AnthropicProvider(api_key=config.api_key, model=config.model)
-        return AnthropicProvider(api_key=config.api_key)
+        return AnthropicProvider(api_key=config.api_key, **kwargs)
     elif config.provider == "openai":
         if not config.api_key:
             raise ValueError("OpenAI API key required")
-        if config.model:
-            return OpenAIProvider(api_key=config.api_key, model=config.model)
-        return OpenAIProvider(api_key=config.api_key)
+        return OpenAIProvider(api_key=config.api_key, **kwargs)
     else:
         raise ValueError(f"Unsupported provider: {config.provider}")
@@ -0,0 +1,216 @@
+# ABOUTME: Client-side rate limiting for LLM requests with AIMD concurrency control.
+# ABOUTME: Keeps request and token throughput under provider limits and backs off on 429s.
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from plex_wrapped.ai.provider import LLMProvider, RateLimitError
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """Per-minute request and input-token budgets for a provider."""
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+# Conservative defaults matching each provider's entry-level API tier
+PROVIDER_LIMITS: dict[str, RateLimits] = {
+    "anthropic": RateLimits(requests_per_minute=50, tokens_per_minute=30_000),
+    "openai": RateLimits(requests_per_minute=500, tokens_per_minute=30_000),
+}
+
+
+class RateLimiter:
+    """Sliding-window request/token limiter with an adaptive concurrency cap.
+
+    The concurrency cap follows AIMD: it grows by about one slot per round of
+    successful requests and is halved by each rate-limit response.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        limits: RateLimits,
+        max_concurrency: int,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize limiter.
+
+        Args:
+            limits: Request and token budgets per minute (None means unlimited)
+            max_concurrency: Upper bound on requests in flight at once
+            increase: Slots added to the cap per round of successful requests
+            decrease: Multiplicative factor applied to the cap on a rate-limit response
+            clock: Monotonic time source
+        """
+        self.limits = limits
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self.concurrency = float(max_concurrency)
+        self._in_flight = 0
+        self._events: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Wait for capacity, then hold a request slot for the duration of the block.
+
+        Args:
+            tokens: Estimated input tokens the request will consume
+        """
+        async with self._condition:
+            while True:
+                wait = self._reserve(tokens)
+                if wait == 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(self._condition.wait(), wait)
+                except TimeoutError:
+                    pass
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _reserve(self, tokens: int) -> Optional[float]:
+        """Take a slot if one is free.
+
+        Returns:
+            0.0 if a slot was taken, otherwise seconds until the window frees up
+            (or None to wait for an in-flight request to finish)
+        """
+        now = self._clock()
+        while self._events and self._events[0][0] <= now - self.WINDOW_SECONDS:
+            _, expired_tokens = self._events.popleft()
+            self._tokens_in_window -= expired_tokens
+
+        if self._in_flight >= max(1, int(self.concurrency)):
+            return None
+
+        rpm = self.limits.requests_per_minute
+        tpm = self.limits.tokens_per_minute
+        over_requests = rpm is not None and len(self._events) >= rpm
+        # A single oversized request is let through once the window is empty
+        over_tokens = (
+            tpm is not None and bool(self._events) and self._tokens_in_window + tokens > tpm
+        )
+        if over_requests or over_tokens:
+            return self._events[0][0] + self.WINDOW_SECONDS - now
+
+        self._events.append((now, tokens))
+        self._tokens_in_window += tokens
+        self._in_flight += 1
+        return 0.0
+
+    def record_success(self) -> None:
+        """Additively grow the concurrency cap after a successful request."""
+        self.concurrency = min(
+            float(self.max_concurrency), self.concurrency + self.increase / self.concurrency
+        )
+
+    def record_rate_limited(self) -> None:
+        """Multiplicatively shrink the concurrency cap after a rate-limit response."""
+        self.concurrency = max(1.0, self.concurrency * self.decrease)
+
+
+class RateLimitedProvider(LLMProvider):
+    """Wraps a provider so every request goes through a RateLimiter.
+
+    Rate-limit responses shrink the limiter's concurrency cap and are retried
+    with increasing backoff. Requests that outlive the timeout are abandoned
+    and retried straight away, so one stalled response can't hold up a run.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        limiter: RateLimiter,
+        max_retries: int = 3,
+        backoff_seconds: float = 2.0,
+        request_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize wrapper.
+
+        Args:
+            provider: Provider to send requests through
+            limiter: Limiter shared by all requests to this provider
+            max_retries: Retries after a rate-limit response or timeout before giving up
+            backoff_seconds: Base delay, multiplied by the attempt number
+            request_timeout: Seconds to wait for each response (None waits indefinitely)
+        """
+        self.provider = provider
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.request_timeout = request_timeout
+        # Exposed so response cache keys match the wrapped provider's
+        self.model = provider.model
+        self.temperature = provider.temperature
+
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
+        """Generate content through the wrapped provider within rate limits.
+
+        Args:
+            prompt: The prompt to send to the LLM.
+            system: Optional static instructions sent ahead of the prompt.
+            max_tokens: Upper bound on generated tokens.
+            json_output: Whether the caller expects a JSON object back.
+
+        Returns:
+            Generated text content.
+
+        Raises:
+            RateLimitError: If the provider is still rate limiting after all retries
+            TimeoutError: If every attempt timed out
+        """
+        # Rough estimate of input tokens at ~4 characters per token
+        tokens = (len(prompt) + len(system or "")) // 4
+        attempt = 0
+        while True:
+            try:
+                async with self.limiter.acquire(tokens):
+                    response = await asyncio.wait_for(
+                        self.provider.generate(
+                            prompt, system=system, max_tokens=max_tokens, json_output=json_output
+                        ),
+                        self.request_timeout,
+                    )
+            except TimeoutError as e:
+                if attempt >= self.max_retries:
+                    if self.request_timeout is None:
+                        # Raised by the provider itself; there's no limit of ours to report
+                        raise
+                    raise TimeoutError(
+                        f"No LLM response within {self.request_timeout:g}s "
+                        f"after {attempt + 1} attempt(s)"
+                    ) from e
+                attempt += 1
+            except RateLimitError:
+                self.limiter.record_rate_limited()
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self.backoff_seconds * attempt)
+            else:
+                self.limiter.record_success()
+                return response
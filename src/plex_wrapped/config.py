@@ -4,11 +4,20 @@
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
-import yaml
 from pydantic import BaseModel, Field, model_validator
 
+# Environment variable holding each LLM provider's API key
+_LLM_KEY_ENV_VARS = {"anthropic": "ANTHROPIC_API_KEY", "openai": "OPENAI_API_KEY"}
+
+# Hosting provider -> (credential field in its section, environment variable)
+_HOSTING_TOKEN_ENV_VARS = {
+    "cloudflare": ("api_token", "CLOUDFLARE_API_TOKEN"),
+    "vercel": ("token", "VERCEL_TOKEN"),
+    "netlify": ("auth_token", "NETLIFY_AUTH_TOKEN"),
+}
+
 
 class PlexConfig(BaseModel):
     """Plex server connection configuration."""
@@ -27,6 +36,29 @@ class LLMConfig(BaseModel):
         None, description="API key for the LLM provider (not required if provider is 'none')"
     )
     model: Optional[str] = Field(None, description="Specific model to use (optional)")
+    max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of LLM requests in flight at once"
+    )
+    requests_per_minute: Optional[int] = Field(
+        None, ge=1, description="Request rate limit (defaults to the provider's entry tier)"
+    )
+    tokens_per_minute: Optional[int] = Field(
+        None, ge=1, description="Input token rate limit (defaults to the provider's entry tier)"
+    )
+    cache: bool = Field(
+        default=True, description="Reuse cached responses for unchanged stats on re-runs"
+    )
+    temperature: float = Field(
+        default=0.0, ge=0.0, le=2.0, description="Sampling temperature for generated content"
+    )
+    request_timeout: Optional[float] = Field(
+        default=120.0,
+        gt=0,
+        description="Seconds to wait for one LLM response before retrying (null: no limit)",
+    )
+    max_retries: int = Field(
+        default=3, ge=0, description="Retries after a timed-out or rate-limited LLM request"
+    )
 
     @model_validator(mode='after')
     def validate_api_key_required(self) -> 'LLMConfig':
@@ -83,13 +115,8 @@ class HostingConfig(BaseModel):
     @model_validator(mode='after')
     def validate_provider_config_exists(self) -> 'HostingConfig':
         """Validate that provider-specific config matches the selected provider."""
-        provider_map = {
-            'cloudflare': self.cloudflare,
-            'vercel': self.vercel,
-            'netlify': self.netlify,
-            'github': self.github,
-        }
-        if self.provider in provider_map and provider_map[self.provider] is None:
+        # Each provider's section is the field named after it
+        if self.provider != "none" and getattr(self, self.provider) is None:
             raise ValueError(f"Missing config for hosting provider '{self.provider}'")
         return self
 
@@ -110,6 +137,9 @@ class Config(BaseModel):
     project_root: Path = Field(
         default=Path("."), description="Project root directory containing frontend/"
     )
+    pretty_json: bool = Field(
+        default=False, description="Indent raw and processed data files for human reading"
+    )
 
 
 def load_config(config_path: Path) -> Config:
@@ -134,44 +164,46 @@ def load_config(config_path: Path) -> Config:
         FileNotFoundError: If config file doesn't exist
         ValueError: If YAML is invalid or config validation fails
     """
+    # Imported here so commands that never load a config don't pay for PyYAML
+    import yaml
+
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
+    # libyaml's C loader when PyYAML was built with it, otherwise the pure-Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
         with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=loader)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in config file: {e}")
 
     if config_data is None:
         raise ValueError("Config file is empty")
 
-    # Apply environment variable fallbacks for sensitive credentials
+    # Apply environment variable fallbacks for sensitive credentials:
+    # (config section, credential field, environment variable)
+    fallbacks: list[tuple[dict[str, Any], str, str]] = []
     if "plex" in config_data:
-        if not config_data["plex"].get("token"):
-            config_data["plex"]["token"] = os.getenv("PLEX_TOKEN")
-
-    if "llm" in config_data:
-        if not config_data["llm"].get("api_key"):
-            provider = config_data["llm"].get("provider", "")
-            if provider == "anthropic":
-                config_data["llm"]["api_key"] = os.getenv("ANTHROPIC_API_KEY")
-            elif provider == "openai":
-                config_data["llm"]["api_key"] = os.getenv("OPENAI_API_KEY")
-
-    if "hosting" in config_data:
-        provider = config_data["hosting"].get("provider", "")
-        if provider == "cloudflare" and "cloudflare" in config_data["hosting"]:
-            if not config_data["hosting"]["cloudflare"].get("api_token"):
-                config_data["hosting"]["cloudflare"]["api_token"] = os.getenv("CLOUDFLARE_API_TOKEN")
-        elif provider == "vercel" and "vercel" in config_data["hosting"]:
-            if not config_data["hosting"]["vercel"].get("token"):
-                config_data["hosting"]["vercel"]["token"] = os.getenv("VERCEL_TOKEN")
-        elif provider == "netlify" and "netlify" in config_data["hosting"]:
-            if not config_data["hosting"]["netlify"].get("auth_token"):
-                config_data["hosting"]["netlify"]["auth_token"] = os.getenv("NETLIFY_AUTH_TOKEN")
+        fallbacks.append((config_data["plex"], "token", "PLEX_TOKEN"))
+
+    llm = config_data.get("llm")
+    if llm is not None and llm.get("provider") in _LLM_KEY_ENV_VARS:
+        fallbacks.append((llm, "api_key", _LLM_KEY_ENV_VARS[llm["provider"]]))
+
+    hosting = config_data.get("hosting")
+    if hosting is not None:
+        provider = hosting.get("provider")
+        if provider in _HOSTING_TOKEN_ENV_VARS and provider in hosting:
+            field, env_var = _HOSTING_TOKEN_ENV_VARS[provider]
+            fallbacks.append((hosting[provider], field, env_var))
+
+    for section, field, env_var in fallbacks:
+        if not section.get(field):
+            section[field] = os.environ.get(env_var)
 
     try:
-        return Config(**config_data)
+        # Runs the model's prebuilt core validator directly on the parsed dict
+        return Config.model_validate(config_data)
     except Exception as e:
         raise ValueError(f"Config validation failed: {e}")
@@ -1,9 +1,16 @@
 # ABOUTME: Plex data extractor for fetching listening history from Plex servers.
 # ABOUTME: Supports multi-user extraction with filtering by year and date ranges.
 
+import sys
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Optional
+from functools import cached_property
+from typing import Any, Callable, Optional
 
+import requests
 from plexapi.server import PlexServer
 from pydantic import BaseModel, Field
 
@@ -11,8 +18,20 @@ from pydantic import BaseModel, Field
 ProgressCallback = Callable[[str], None]
 
 
-class Track(BaseModel):
-    """Represents a single track listening event."""
+def _join_genres(genres: Optional[list[Any]]) -> Optional[str]:
+    """Join Plex genre tags into a comma-separated string, or None if there are none."""
+    if not genres:
+        return None
+    return ", ".join(genre.tag for genre in genres)
+
+
+@dataclass(slots=True, kw_only=True)
+class Track:
+    """Represents a single track listening event.
+
+    A plain dataclass rather than a model since one is created per play; validation
+    happens at the ListeningHistory boundary when histories are loaded from disk.
+    """
 
     title: str
     artist: str
@@ -29,6 +48,43 @@ class Track(BaseModel):
         return self.duration_ms / 60000.0
 
 
+@dataclass(slots=True)
+class TrackColumns:
+    """Column-oriented view of a track list, one parallel sequence per field.
+
+    Aggregations over a single field (counting artists, summing durations) can run
+    over one flat sequence instead of reading an attribute off every Track.
+    """
+
+    title: list[str]
+    artist: list[str]
+    album: list[str]
+    duration_ms: array
+    played_at: list[datetime]
+    genre: list[Optional[str]]
+    thumb_url: list[Optional[str]]
+
+    @classmethod
+    def from_tracks(cls, tracks: list[Track]) -> "TrackColumns":
+        """Build columns from a list of tracks.
+
+        Args:
+            tracks: Tracks to transpose
+
+        Returns:
+            TrackColumns with one entry per track, in track order
+        """
+        return cls(
+            title=[track.title for track in tracks],
+            artist=[track.artist for track in tracks],
+            album=[track.album for track in tracks],
+            duration_ms=array("q", [track.duration_ms for track in tracks]),
+            played_at=[track.played_at for track in tracks],
+            genre=[track.genre for track in tracks],
+            thumb_url=[track.thumb_url for track in tracks],
+        )
+
+
 class ListeningHistory(BaseModel):
     """Aggregated listening history for a user."""
 
@@ -42,42 +98,92 @@ class ListeningHistory(BaseModel):
         """Total number of tracks listened to."""
         return len(self.tracks)
 
-    @property
+    @cached_property
+    def columns(self) -> TrackColumns:
+        """Column-oriented view of the tracks.
+
+        Built once on first access; tracks are not expected to change after extraction.
+        """
+        return TrackColumns.from_tracks(self.tracks)
+
+    @cached_property
     def total_minutes(self) -> float:
-        """Total listening time in minutes."""
-        return sum(track.duration_minutes for track in self.tracks)
+        """Total listening time in minutes.
+
+        Computed once on first access; tracks are not expected to change after extraction.
+        """
+        return sum(self.columns.duration_ms) / 60000.0
 
 
 class PlexExtractor:
     """Extracts listening history from Plex Media Server."""
 
-    def __init__(self, url: str, token: str) -> None:
+    def __init__(
+        self, url: str, token: str, session: Optional[requests.Session] = None
+    ) -> None:
         """Initialize Plex extractor.
 
         Args:
             url: Plex server URL (e.g., 'https://plex.example.com')
             token: Plex authentication token
+            session: Optional HTTP session to reuse open connections across extractors
         """
         self.url = url
         self.token = token
+        self.session = session
         self._server: Optional[PlexServer] = None
         self._duration_cache: Optional[dict[tuple[str, str], int]] = None
+        self._account = None
+        self._users_by_name: Optional[dict[str, Any]] = None
+        self._music_library = None
 
     def connect(self) -> PlexServer:
         """Establish connection to Plex server.
 
+        Also discovers the music library and the server's users up front, so
+        extraction doesn't repeat those lookups.
+
         Returns:
             Connected PlexServer instance
 
         Raises:
             ConnectionError: If unable to connect to Plex server
+            ValueError: If the server has no music library
         """
+        self._account = None
+        self._users_by_name = None
+        self._music_library = None
         try:
-            self._server = PlexServer(self.url, self.token)
-            return self._server
+            self._server = PlexServer(self.url, self.token, session=self.session)
+
+            # Users come from plex.tv and sections from the server itself,
+            # so fetch them concurrently
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                users_future = executor.submit(self._get_users_by_name)
+                sections = self._server.library.sections()
+                users_future.result()
         except Exception as e:
+            self._server = None
             raise ConnectionError(f"Failed to connect to Plex server: {e}") from e
 
+        music_libraries = [section for section in sections if section.type == "artist"]
+        if not music_libraries:
+            self._server = None
+            raise ValueError("No music libraries found on Plex server")
+        self._music_library = music_libraries[0]
+        return self._server
+
+    @property
+    def music_library(self) -> Any:
+        """The server's music library section, found once by connect().
+
+        Raises:
+            RuntimeError: If not connected to server
+        """
+        if not self._server:
+            raise RuntimeError("Not connected. Call connect() first.")
+        return self._music_library
+
     def get_users(self) -> list[str]:
         """Get list of usernames with access to the Plex server.
 
@@ -90,19 +196,26 @@ class PlexExtractor:
         if not self._server:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        users = []
-        # Get the account owner
-        account = self._server.myPlexAccount()
-        users.append(account.username)
-
-        # Get shared users and managed/home users
-        for user in account.users():
-            # Managed users may have title instead of username
-            name = user.username or user.title or getattr(user, "name", None)
-            if name:
-                users.append(name)
-
-        return users
+        # Account owner first, then shared users and managed/home users
+        return [self._get_account().username, *self._get_users_by_name()]
+
+    def _get_account(self):
+        """Get the server owner's MyPlexAccount, fetched once per connection."""
+        if self._account is None:
+            self._account = self._server.myPlexAccount()
+        return self._account
+
+    def _get_users_by_name(self) -> dict[str, Any]:
+        """Get shared and managed users keyed by display name, fetched once per connection."""
+        if self._users_by_name is None:
+            users_by_name: dict[str, Any] = {}
+            for user in self._get_account().users():
+                # Managed users may have title instead of username
+                name = user.username or user.title or getattr(user, "name", None)
+                if name:
+                    users_by_name[name] = user
+            self._users_by_name = users_by_name
+        return self._users_by_name
 
     def _build_track_duration_cache(
         self,
@@ -166,19 +279,12 @@ class PlexExtractor:
 
         Raises:
             RuntimeError: If not connected to server
-            ValueError: If user not found or no music libraries available
+            ValueError: If user not found or history can't be fetched
         """
         if not self._server:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        # Find music library
-        music_libraries = [
-            section for section in self._server.library.sections() if section.type == "artist"
-        ]
-        if not music_libraries:
-            raise ValueError("No music libraries found on Plex server")
-
-        music_library = music_libraries[0]
+        music_library = self._music_library
 
         # Build duration cache from library tracks (history items don't include duration)
         # Cache is built once and reused across all user extractions
@@ -189,7 +295,6 @@ class PlexExtractor:
         duration_cache = self._duration_cache
 
         # Get user's listening history
-        tracks = []
         try:
             # Get all track plays for the user from server-level history
             # LibrarySection.history() doesn't support accountID, but PlexServer.history() does
@@ -202,77 +307,106 @@ class PlexExtractor:
                 librarySectionID=music_library.key,
                 mindate=start_date,
             )
+            tracks = self._tracks_from_history(
+                history_items, username, duration_cache, end_date, on_progress
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to extract history for user {username}: {e}") from e
 
-            # Convert to list to get total count
-            history_list = list(history_items)
-            total_items = len(history_list)
+        return ListeningHistory(
+            user=username,
+            year=year,
+            tracks=tracks,
+            avatar_url=self._get_avatar_url(username),
+        )
 
-            if on_progress:
-                on_progress(f"  Processing {total_items:,} history items for {username}...")
-
-            for i, item in enumerate(history_list):
-                # Filter by end_date manually since plexapi doesn't support maxdate
-                if end_date and hasattr(item, "viewedAt") and item.viewedAt > end_date:
-                    continue
-
-                # Skip tracks without essential data
-                if not item.title or not hasattr(item, "viewedAt") or not item.viewedAt:
-                    continue
-
-                # Extract track information
-                artist_name = item.grandparentTitle or "Unknown Artist"
-
-                # Build full thumb URL with server base and token
-                thumb_url = None
-                if hasattr(item, "thumb") and item.thumb:
-                    thumb_url = f"{self.url}{item.thumb}?X-Plex-Token={self.token}"
-
-                # Look up duration from cache (history items don't have duration)
-                duration_ms = duration_cache.get((item.title, artist_name), 0)
-
-                track = Track(
-                    title=item.title,
-                    artist=artist_name,
-                    album=item.parentTitle or "Unknown Album",
-                    duration_ms=duration_ms,
-                    played_at=item.viewedAt,
-                    user=username,
-                    genre=", ".join([g.tag for g in item.genres]) if hasattr(item, "genres") and item.genres else None,
-                    thumb_url=thumb_url,
-                )
-                tracks.append(track)
+    def _tracks_from_history(
+        self,
+        history_items: list[Any],
+        username: str,
+        duration_cache: dict[tuple[str, str], int],
+        end_date: Optional[datetime] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> list[Track]:
+        """Convert one user's Plex history items into tracks.
 
-                # Report progress every 500 items
-                if on_progress and (i + 1) % 500 == 0:
-                    on_progress(f"  Processing history: {i + 1:,}/{total_items:,} for {username}")
+        Args:
+            history_items: Plex history items belonging to the user
+            username: User the plays belong to
+            duration_cache: Track durations keyed by (title, artist)
+            end_date: Optional end date filter (inclusive)
+            on_progress: Optional callback for progress updates
 
-            if on_progress:
-                on_progress(f"  Found {len(tracks):,} tracks for {username}")
+        Returns:
+            List of Track objects, one per valid play
+        """
+        if on_progress:
+            on_progress(f"  Processing {len(history_items):,} history items for {username}...")
+
+        # Skip plays without essential data, and filter by end_date manually
+        # since plexapi doesn't support maxdate
+        tracks = [
+            self._track_from_history_item(item, username, duration_cache)
+            for item in history_items
+            if item.title
+            and getattr(item, "viewedAt", None)
+            and not (end_date and item.viewedAt > end_date)
+        ]
 
-        except Exception as e:
-            raise ValueError(f"Failed to extract history for user {username}: {e}") from e
+        if on_progress:
+            on_progress(f"  Found {len(tracks):,} tracks for {username}")
 
-        # Get user avatar if available
-        avatar_url = None
+        return tracks
+
+    def _get_avatar_url(self, username: str) -> Optional[str]:
+        """Look up a user's avatar URL.
+
+        Args:
+            username: Username to look up
+
+        Returns:
+            Avatar URL, or None if unavailable
+        """
         try:
-            account = self._server.myPlexAccount()
+            account = self._get_account()
             if account.username == username:
-                avatar_url = account.thumb if hasattr(account, "thumb") else None
-            else:
-                for user in account.users():
-                    user_name = user.username or user.title or getattr(user, "name", None)
-                    if user_name == username:
-                        avatar_url = user.thumb if hasattr(user, "thumb") else None
-                        break
+                return getattr(account, "thumb", None)
+            return getattr(self._get_users_by_name().get(username), "thumb", None)
         except Exception:
             # Avatar extraction is non-critical
-            pass
+            return None
 
-        return ListeningHistory(
+    def _track_from_history_item(
+        self, item: Any, username: str, duration_cache: dict[tuple[str, str], int]
+    ) -> Track:
+        """Build a Track from a Plex history item.
+
+        Args:
+            item: Plex history item for a track play
+            username: User the play belongs to
+            duration_cache: Track durations keyed by (title, artist)
+
+        Returns:
+            Track for the play
+        """
+        # Intern the heavily repeated strings so plays of the same artist/album share one object
+        artist_name = sys.intern(item.grandparentTitle or "Unknown Artist")
+        genre = _join_genres(getattr(item, "genres", None))
+
+        # Build full thumb URL with server base and token
+        thumb = getattr(item, "thumb", None)
+        thumb_url = f"{self.url}{thumb}?X-Plex-Token={self.token}" if thumb else None
+
+        return Track(
+            title=item.title,
+            artist=artist_name,
+            album=sys.intern(item.parentTitle or "Unknown Album"),
+            # History items don't have duration, so look it up from the library cache
+            duration_ms=duration_cache.get((item.title, artist_name), 0),
+            played_at=item.viewedAt,
             user=username,
-            year=year,
-            tracks=tracks,
-            avatar_url=avatar_url,
+            genre=sys.intern(genre) if genre else None,
+            thumb_url=thumb_url,
         )
 
     def extract_all_users(
@@ -284,6 +418,9 @@ class PlexExtractor:
     ) -> list[ListeningHistory]:
         """Extract listening history for all users.
 
+        History for every account is fetched in a single request and bucketed
+        by account ID, rather than issuing one history request per user.
+
         Args:
             year: Year to extract (for metadata)
             start_date: Optional start date filter (inclusive)
@@ -295,6 +432,7 @@ class PlexExtractor:
 
         Raises:
             RuntimeError: If not connected to server
+            ValueError: If history can't be fetched
         """
         if not self._server:
             raise RuntimeError("Not connected. Call connect() first.")
@@ -305,20 +443,50 @@ class PlexExtractor:
         if on_progress:
             on_progress(f"Found {len(users)} users to extract")
 
-        for i, username in enumerate(users):
+        music_library = self._music_library
+
+        # Build duration cache from library tracks (history items don't include duration)
+        if self._duration_cache is None:
             if on_progress:
-                on_progress(f"Extracting user {i + 1}/{len(users)}: {username}")
+                on_progress("  Building track duration cache...")
+            self._duration_cache = self._build_track_duration_cache(music_library, on_progress)
+
+        if on_progress:
+            on_progress("  Fetching history for all users...")
 
+        try:
+            # Omitting accountID returns plays from every account on the server
+            history_items = self._server.history(
+                librarySectionID=music_library.key,
+                mindate=start_date,
+            )
+        except Exception as e:
+            raise ValueError(f"Failed to fetch listening history: {e}") from e
+
+        items_by_account: defaultdict[int, list[Any]] = defaultdict(list)
+        for item in history_items:
+            items_by_account[item.accountID].append(item)
+
+        for i, username in enumerate(users):
             try:
-                history = self.extract_user_history(
-                    username=username,
-                    year=year,
-                    start_date=start_date,
-                    end_date=end_date,
-                    on_progress=on_progress,
+                tracks = self._tracks_from_history(
+                    items_by_account.get(self._get_user_account_id(username), []),
+                    username,
+                    self._duration_cache,
+                    end_date,
+                    on_progress,
                 )
-                if history.total_tracks > 0:
-                    histories.append(history)
+                if on_progress:
+                    on_progress(f"Extracted user {i + 1}/{len(users)}: {username}")
+                if tracks:
+                    histories.append(
+                        ListeningHistory(
+                            user=username,
+                            year=year,
+                            tracks=tracks,
+                            avatar_url=self._get_avatar_url(username),
+                        )
+                    )
             except Exception as e:
                 # Log but continue with other users
                 if on_progress:
@@ -343,18 +511,13 @@ class PlexExtractor:
         if not self._server:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        account = self._server.myPlexAccount()
-
         # Check if it's the account owner
         # Server owner uses local account ID 1, not their Plex.tv cloud ID
-        if account.username == username:
+        if self._get_account().username == username:
             return 1
 
         # Check shared users and managed/home users
-        for user in account.users():
-            # Managed users may have title instead of username
-            user_name = user.username or user.title or getattr(user, "name", None)
-            if user_name == username:
-                return user.id
-
-        raise ValueError(f"User {username} not found on Plex server")
+        user = self._get_users_by_name().get(username)
+        if user is None:
+            raise ValueError(f"User {username} not found on Plex server")
+        return user.id
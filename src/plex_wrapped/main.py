@@ -4,13 +4,16 @@
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.console import Console
 
 from plex_wrapped.config import load_config
-from plex_wrapped.orchestrator import Orchestrator
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime so --help and preview don't load the Plex/AI stack
+    from plex_wrapped.orchestrator import Orchestrator
 
 app = typer.Typer(
     name="plex-wrapped",
@@ -49,7 +52,7 @@ def main(ctx: typer.Context) -> None:
         setup.run()
 
 
-def get_orchestrator(config_path: str, year: Optional[int] = None) -> Orchestrator:
+def get_orchestrator(config_path: str, year: Optional[int] = None) -> "Orchestrator":
     """Load config and create orchestrator instance.
 
     Args:
@@ -62,6 +65,8 @@ def get_orchestrator(config_path: str, year: Optional[int] = None) -> Orchestrat
     Raises:
         SystemExit: If config loading fails
     """
+    from plex_wrapped.orchestrator import Orchestrator
+
     try:
         config = load_config(Path(config_path))
         if year is not None:
@@ -1,9 +1,15 @@
 # ABOUTME: Orchestrates the complete Plex Wrapped workflow from extraction to deployment.
 # ABOUTME: Coordinates Plex extraction, stats processing, AI generation, and hosting deployment.
 
-import json
+import asyncio
+import hashlib
+import multiprocessing
+import os
 import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Callable, Optional
 
@@ -11,28 +17,197 @@ from typing import Any, Callable, Optional
 ProgressCallback = Callable[[str], None]
 
 from rich.console import Console
+from rich.markup import escape
 
 import httpx
+import orjson
+import requests
+from pydantic import TypeAdapter
+from requests.adapters import HTTPAdapter
 
 from plex_wrapped.utils import slugify
-from plex_wrapped.ai.generators import (
-    AuraGenerator,
-    HotTakesGenerator,
-    NarrativeGenerator,
-    PersonalityGenerator,
-    RoastGenerator,
-    SuggestionsGenerator,
-    SuperlativesGenerator,
-    ThemeGenerator,
+from plex_wrapped.ai.cache import ResponseCache
+from plex_wrapped.ai.generators import BaseGenerator, CompositeGenerator, ThemeGenerator
+from plex_wrapped.ai.provider import LLMProvider, get_provider
+from plex_wrapped.ai.rate_limiter import (
+    PROVIDER_LIMITS,
+    RateLimitedProvider,
+    RateLimiter,
+    RateLimits,
 )
-from plex_wrapped.ai.provider import get_provider
 from plex_wrapped.config import Config
-from plex_wrapped.extractors.plex import PlexExtractor
+from plex_wrapped.extractors.plex import ListeningHistory, PlexExtractor
 from plex_wrapped.processors.stats import StatsProcessor
 from plex_wrapped.processors.time_analysis import TimeAnalysisProcessor
 
 console = Console()
 
+# Image downloads in flight at once per user
+IMAGE_DOWNLOAD_CONCURRENCY = 16
+# Bytes read per chunk while streaming an image to disk
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# Plex library searches in flight at once while matching top items to artwork
+PLEX_SEARCH_CONCURRENCY = 8
+
+# Saved extension by content-type keyword; anything else is saved as .jpg
+_IMAGE_SUFFIXES = (("png", ".png"), ("webp", ".webp"), ("gif", ".gif"))
+
+
+def _image_suffix(content_type: str) -> str:
+    """Pick the file extension for a downloaded image from its content type."""
+    for keyword, suffix in _IMAGE_SUFFIXES:
+        if keyword in content_type:
+            return suffix
+    return ".jpg"
+
+
+# Built once per process and reused for every user's raw history file
+_HISTORY_ADAPTER = TypeAdapter(ListeningHistory)
+
+
+def _build_image_mapping(output_dir: Path, username: str) -> dict[str, str]:
+    """Build a mapping from slugified names to local image paths.
+
+    Args:
+        output_dir: Output directory the images were downloaded under
+        username: Username to get images for
+
+    Returns:
+        Dict mapping type:slugname to local path (e.g., "artist:nofx" -> "/images/milo/artist-nofx-xxx.jpg")
+    """
+    images_dir = output_dir / "images" / username
+    if not images_dir.exists():
+        return {}
+
+    mapping: dict[str, str] = {}
+    for img_file in images_dir.iterdir():
+        if not img_file.is_file():
+            continue
+        name = img_file.stem
+        local_path = f"/images/{username}/{img_file.name}"
+
+        # Parse filename format: type-name-hash or type-artist-name-hash
+        parts = name.rsplit("-", 1)  # Remove hash
+        if len(parts) < 2:
+            continue
+        name_part = parts[0]
+
+        if name_part.startswith("artist-"):
+            artist_slug = name_part[7:]  # Remove "artist-"
+            mapping[f"artist:{artist_slug}"] = local_path
+        elif name_part.startswith("album-"):
+            # Format: album-{artist}-{album}
+            rest = name_part[6:]  # Remove "album-"
+            mapping[f"album:{rest}"] = local_path
+        elif name_part.startswith("track-"):
+            # Format: track-{artist}-{track}
+            rest = name_part[6:]  # Remove "track-"
+            mapping[f"track:{rest}"] = local_path
+
+    return mapping
+
+def _process_raw_file(
+    raw_file: Path, year: int, output_dir: Path
+) -> tuple[str, str, dict[str, Any]]:
+    """Compute stats for one user's raw history file.
+
+    Runs in a worker process. It is a module-level function taking only plain
+    arguments, so tasks don't pickle the Orchestrator and its config secrets.
+
+    Args:
+        raw_file: Path to a {username}_{year}_raw.json file
+        year: Configured year, used when the filename doesn't carry one
+        output_dir: Output directory holding the downloaded images
+
+    Returns:
+        Tuple of (username, year from filename, stats dict)
+    """
+    # Extract username and year from filename: {username}_{year}_raw.json
+    stem = raw_file.stem  # e.g., "detour1999_2024_raw"
+    if stem.endswith("_raw"):
+        stem = stem[:-4]  # Remove "_raw" suffix
+
+    # Extract username (everything before last underscore which should be year)
+    parts = stem.rsplit("_", 1)
+    if len(parts) == 2 and parts[1].isdigit():
+        username = parts[0]
+        file_year = parts[1]
+    else:
+        # Fallback for old format files without year
+        username = stem
+        file_year = str(year)
+
+    # Load raw history, parsing and validating straight from bytes
+    history = _HISTORY_ADAPTER.validate_json(raw_file.read_bytes())
+
+    # Build image mapping from downloaded images
+    image_mapping = _build_image_mapping(output_dir, username)
+
+    # Generate stats
+    stats_processor = StatsProcessor(history)
+    time_processor = TimeAnalysisProcessor(history)
+
+    # Build stats with local image URLs where available
+    top_artists = []
+    for item in stats_processor.top_artists(10):
+        artist_key = f"artist:{slugify(item.name)}"
+        image_url = image_mapping.get(artist_key, item.image_url)
+        top_artists.append({
+            "name": item.name,
+            "plays": item.plays,
+            "minutes": item.minutes,
+            "image_url": image_url,
+        })
+
+    top_tracks = []
+    for item in stats_processor.top_tracks(10):
+        track_key = f"track:{slugify(item.artist or '')}-{slugify(item.name)}"
+        album_key = f"album:{slugify(item.artist or '')}-{slugify(item.album or '')}"
+        image_url = image_mapping.get(track_key) or image_mapping.get(album_key) or item.image_url
+        top_tracks.append({
+            "name": item.name,
+            "artist": item.artist,
+            "album": item.album,
+            "plays": item.plays,
+            "minutes": item.minutes,
+            "image_url": image_url,
+        })
+
+    top_albums = []
+    for item in stats_processor.top_albums(10):
+        album_key = f"album:{slugify(item.artist or '')}-{slugify(item.name)}"
+        image_url = image_mapping.get(album_key, item.image_url)
+        top_albums.append({
+            "name": item.name,
+            "artist": item.artist,
+            "plays": item.plays,
+            "minutes": item.minutes,
+            "image_url": image_url,
+        })
+
+    stats = {
+        "user": username,
+        "year": year,
+        "total": stats_processor.total_stats(),
+        "top_artists": top_artists,
+        "top_tracks": top_tracks,
+        "top_albums": top_albums,
+        "time_analysis": {
+            "plays_by_hour": time_processor.plays_by_hour(),
+            "plays_by_day_of_week": time_processor.plays_by_day_of_week(),
+            "plays_by_month": time_processor.plays_by_month(),
+            "peak_listening_hour": time_processor.peak_listening_hour(),
+            "peak_listening_day": time_processor.peak_listening_day(),
+            "peak_day_overall": time_processor.peak_day_overall(),
+            "longest_streak": time_processor.longest_streak(),
+            "late_night_anthem": time_processor.late_night_anthem(),
+            "most_repeated_single_day": time_processor.most_repeated_single_day(),
+        },
+    }
+
+    return username, file_year, stats
+
 
 class Orchestrator:
     """Orchestrates the complete Plex Wrapped workflow."""
@@ -46,6 +221,18 @@ class Orchestrator:
         self.config = config
         self.output_dir = config.output_dir
         self.project_root = config.project_root
+        # One connection pool for every Plex request this orchestrator makes, sized
+        # so concurrent artwork searches don't queue for a connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=PLEX_SEARCH_CONCURRENCY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _plex_extractor(self) -> PlexExtractor:
+        """Create an extractor for the configured server that shares this session."""
+        return PlexExtractor(
+            url=self.config.plex.url, token=self.config.plex.token, session=self.session
+        )
 
     def extract(self, on_progress: Optional[ProgressCallback] = None) -> None:
         """Extract listening history from Plex server.
@@ -55,7 +242,7 @@ class Orchestrator:
         """
         console.print("[bold blue]Extracting listening history from Plex...[/bold blue]")
 
-        extractor = PlexExtractor(url=self.config.plex.url, token=self.config.plex.token)
+        extractor = self._plex_extractor()
         extractor.connect()
 
         start_date = datetime(self.config.year, 1, 1)
@@ -72,6 +259,7 @@ class Orchestrator:
         data_dir = self.output_dir / "data"
         data_dir.mkdir(parents=True, exist_ok=True)
 
+        indent = 2 if self.config.pretty_json else None
         for i, history in enumerate(histories):
             # Download images while we have the live Plex connection
             msg = f"Downloading images for {history.user} ({i + 1}/{len(histories)})..."
@@ -81,8 +269,7 @@ class Orchestrator:
             self._download_images_for_user(history, extractor, on_progress)
 
             user_file = data_dir / f"{history.user}_{self.config.year}_raw.json"
-            with open(user_file, "w") as f:
-                json.dump(history.model_dump(mode="json"), f, indent=2, default=str)
+            user_file.write_bytes(_HISTORY_ADAPTER.dump_json(history, indent=indent))
 
         console.print(
             f"[green]Extracted data for {len(histories)} users to {data_dir}[/green]"
@@ -123,8 +310,6 @@ class Orchestrator:
             extractor: PlexExtractor with active connection
             on_progress: Optional callback for progress updates
         """
-        import hashlib
-
         images_dir = self.output_dir / "images" / history.user
         images_dir.mkdir(parents=True, exist_ok=True)
 
@@ -134,35 +319,49 @@ class Orchestrator:
         top_tracks = stats_processor.top_tracks(10)
         top_albums = stats_processor.top_albums(10)
 
-        # Get the music library for lookups
-        music_libraries = [
-            section for section in extractor._server.library.sections() if section.type == "artist"
-        ]
-        if not music_libraries:
-            console.print("    [yellow]No music library found, skipping images[/yellow]")
-            return
-        music_library = music_libraries[0]
+        # The music library connect() already found; no per-user section scan
+        music_library = extractor.music_library
+
+        # Run every library search up front, concurrently, instead of one category
+        # after another. Top tracks mostly come from top albums, so each album
+        # title is searched once and shared by both lookups.
+        album_titles = list(
+            dict.fromkeys([item.name for item in top_albums] + [item.album for item in top_tracks])
+        )
+        searches = [("artist", item.name) for item in top_artists]
+        searches += [("album", title) for title in album_titles]
+
+        def search(job: tuple[str, Optional[str]]) -> list[Any]:
+            kind, title = job
+            try:
+                if kind == "artist":
+                    return music_library.searchArtists(title=title, maxresults=1)
+                return music_library.searchAlbums(title=title, maxresults=5)
+            except Exception:
+                return []
+
+        with ThreadPoolExecutor(max_workers=PLEX_SEARCH_CONCURRENCY) as pool:
+            results = list(pool.map(search, searches))
+        artist_results = results[: len(top_artists)]
+        album_results = dict(zip(album_titles, results[len(top_artists) :]))
 
-        # Collect images to download by looking up items in current library
+        # Collect images to download from the current library's matches
         images_to_download: list[tuple[str, str, str]] = []  # (url, filename, item_key)
 
-        # Look up top artists
-        for item in top_artists:
+        # Top artists
+        for item, matches in zip(top_artists, artist_results):
             try:
-                results = music_library.searchArtists(title=item.name, maxresults=1)
-                if results and results[0].thumb:
-                    url = f"{extractor.url}{results[0].thumb}?X-Plex-Token={extractor.token}"
+                if matches and matches[0].thumb:
+                    url = f"{extractor.url}{matches[0].thumb}?X-Plex-Token={extractor.token}"
                     filename = f"artist-{slugify(item.name)}"
                     images_to_download.append((url, filename, f"artist:{item.name}"))
             except Exception:
                 pass
 
-        # Look up top albums
+        # Top albums: find the search result matching the artist
         for item in top_albums:
             try:
-                results = music_library.searchAlbums(title=item.name, maxresults=5)
-                # Find album matching artist
-                for album in results:
+                for album in album_results[item.name]:
                     if album.parentTitle == item.artist and album.thumb:
                         url = f"{extractor.url}{album.thumb}?X-Plex-Token={extractor.token}"
                         filename = f"album-{slugify(item.artist or '')}-{slugify(item.name)}"
@@ -171,11 +370,10 @@ class Orchestrator:
             except Exception:
                 pass
 
-        # Look up top tracks (use album art)
+        # Top tracks (use album art)
         for item in top_tracks:
             try:
-                results = music_library.searchAlbums(title=item.album, maxresults=5)
-                for album in results:
+                for album in album_results[item.album]:
                     if album.parentTitle == item.artist and album.thumb:
                         url = f"{extractor.url}{album.thumb}?X-Plex-Token={extractor.token}"
                         filename = f"track-{slugify(item.artist or '')}-{slugify(item.name)}"
@@ -194,60 +392,10 @@ class Orchestrator:
 
         console.print(f"    [dim]Found {len(unique_images)} unique images to download[/dim]")
 
-        # Track item key to local path for updating tracks later
-        key_to_local: dict[str, str] = {}
-        downloaded = 0
-        failed = 0
-
-        # Download each unique image
-        with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-            for url, name, key in unique_images:
-                url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-                filename = f"{name}-{url_hash}.jpg"
-                filepath = images_dir / filename
-                local_path = f"/images/{history.user}/{filename}"
-
-                # Skip if already downloaded
-                if filepath.exists():
-                    key_to_local[key] = local_path
-                    continue
-
-                # Retry logic: 3 attempts with exponential backoff (1s, 2s, 4s)
-                max_retries = 3
-                retry_delay = 1.0
-                success = False
-
-                for attempt in range(max_retries):
-                    try:
-                        response = client.get(url)
-                        response.raise_for_status()
-
-                        # Adjust extension based on content type
-                        content_type = response.headers.get("content-type", "image/jpeg")
-                        if "png" in content_type:
-                            filepath = filepath.with_suffix(".png")
-                            local_path = local_path.replace(".jpg", ".png")
-                        elif "webp" in content_type:
-                            filepath = filepath.with_suffix(".webp")
-                            local_path = local_path.replace(".jpg", ".webp")
-
-                        filepath.write_bytes(response.content)
-                        key_to_local[key] = local_path
-                        downloaded += 1
-                        success = True
-                        break
-                    except httpx.HTTPError:
-                        if attempt < max_retries - 1:
-                            import time
-                            time.sleep(retry_delay)
-                            retry_delay *= 2
-                        continue
-                    except Exception:
-                        # Non-HTTP errors (filesystem, etc.) don't retry
-                        break
-
-                if not success:
-                    failed += 1
+        # Fetch every unique image concurrently over one connection pool
+        key_to_local, downloaded, failed = asyncio.run(
+            self._download_images(unique_images, images_dir, history.user)
+        )
 
         # Update track thumb_urls to local paths for matching top tracks
         # Create lookup for artist:album to local path
@@ -274,45 +422,126 @@ class Orchestrator:
         else:
             console.print()
 
-    def _build_image_mapping(self, username: str) -> dict[str, str]:
-        """Build a mapping from slugified names to local image paths.
+    async def _download_images(
+        self, images: list[tuple[str, str, str]], images_dir: Path, username: str
+    ) -> tuple[dict[str, str], int, int]:
+        """Download images concurrently with a shared async client.
 
         Args:
-            username: Username to get images for
+            images: (url, filename stem, item key) for each unique image
+            images_dir: Directory to save images into
+            username: User the images belong to, used in the served paths
 
         Returns:
-            Dict mapping type:slugname to local path (e.g., "artist:nofx" -> "/images/milo/artist-nofx-xxx.jpg")
+            Tuple of (item key -> local path, images downloaded, images failed)
         """
-        images_dir = self.output_dir / "images" / username
-        if not images_dir.exists():
-            return {}
+        # One directory listing answers "already downloaded?" for every image,
+        # whatever extension it was saved with
+        listing = await asyncio.to_thread(os.listdir, images_dir)
+        on_disk = {path.stem: path.suffix for path in map(Path, listing)}
 
-        mapping: dict[str, str] = {}
-        for img_file in images_dir.iterdir():
-            if not img_file.is_file():
-                continue
-            name = img_file.stem
-            local_path = f"/images/{username}/{img_file.name}"
+        # Track item key to local path for updating tracks later
+        key_to_local: dict[str, str] = {}
+        pending: list[tuple[str, str, str]] = []
+        for url, name, key in images:
+            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+            stem = f"{name}-{url_hash}"
+            suffix = on_disk.get(stem)
+            if suffix is not None:
+                key_to_local[key] = f"/images/{username}/{stem}{suffix}"
+            else:
+                pending.append((url, stem, key))
+
+        semaphore = asyncio.Semaphore(IMAGE_DOWNLOAD_CONCURRENCY)
+        limits = httpx.Limits(max_connections=IMAGE_DOWNLOAD_CONCURRENCY)
+        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True, limits=limits) as client:
+            results = await asyncio.gather(
+                *(
+                    self._download_image(client, semaphore, url, images_dir, stem)
+                    for url, stem, _ in pending
+                )
+            )
+
+        downloaded = 0
+        for (_, _, key), saved_path in zip(pending, results):
+            if saved_path is not None:
+                key_to_local[key] = f"/images/{username}/{saved_path.name}"
+                downloaded += 1
+        return key_to_local, downloaded, len(pending) - downloaded
+
+    async def _download_image(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        images_dir: Path,
+        stem: str,
+    ) -> Optional[Path]:
+        """Download one image, retrying HTTP errors with exponential backoff.
+
+        Args:
+            client: Shared async HTTP client
+            semaphore: Limits how many requests are in flight at once
+            url: Image URL
+            images_dir: Directory to save the image into
+            stem: File name without extension; the extension follows the content type
+
+        Returns:
+            Path the image was saved to, or None if it couldn't be downloaded
+        """
+        # Retry logic: 3 attempts with exponential backoff (1s, 2s, 4s)
+        max_retries = 3
+        retry_delay = 1.0
 
-            # Parse filename format: type-name-hash or type-artist-name-hash
-            parts = name.rsplit("-", 1)  # Remove hash
-            if len(parts) < 2:
+        for attempt in range(max_retries):
+            part_path: Optional[Path] = None
+            try:
+                # Only the request holds a slot, so backoff sleeps don't starve others
+                async with semaphore, client.stream("GET", url) as response:
+                    response.raise_for_status()
+
+                    content_type = response.headers.get("content-type", "image/jpeg")
+                    filepath = images_dir / f"{stem}{_image_suffix(content_type)}"
+                    # Written in chunks under a temporary name, so a dropped connection
+                    # never leaves a partial image that looks downloaded. File calls run
+                    # in a thread to keep them off the event loop other downloads share
+                    part_path = filepath.with_name(f"{filepath.name}.part")
+                    f = await asyncio.to_thread(open, part_path, "wb")
+                    try:
+                        async for chunk in response.aiter_bytes(IMAGE_CHUNK_SIZE):
+                            await asyncio.to_thread(f.write, chunk)
+                    finally:
+                        await asyncio.to_thread(f.close)
+                await asyncio.to_thread(part_path.replace, filepath)
+                return filepath
+            except httpx.HTTPError:
+                if part_path is not None:
+                    await asyncio.to_thread(part_path.unlink, missing_ok=True)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
                 continue
-            name_part = parts[0]
-
-            if name_part.startswith("artist-"):
-                artist_slug = name_part[7:]  # Remove "artist-"
-                mapping[f"artist:{artist_slug}"] = local_path
-            elif name_part.startswith("album-"):
-                # Format: album-{artist}-{album}
-                rest = name_part[6:]  # Remove "album-"
-                mapping[f"album:{rest}"] = local_path
-            elif name_part.startswith("track-"):
-                # Format: track-{artist}-{track}
-                rest = name_part[6:]  # Remove "track-"
-                mapping[f"track:{rest}"] = local_path
-
-        return mapping
+            except Exception:
+                # Non-HTTP errors (filesystem, etc.) don't retry
+                if part_path is not None:
+                    await asyncio.to_thread(part_path.unlink, missing_ok=True)
+                break
+
+        return None
+
+    @staticmethod
+    def _report_processed(
+        file_idx: int,
+        total: int,
+        result: tuple[str, str, dict[str, Any]],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Print progress for a processed user."""
+        username, file_year, _ = result
+        msg = f"Processed user {file_idx + 1}/{total}: {username} ({file_year})"
+        console.print(msg)
+        if on_progress:
+            on_progress(msg)
 
     def process(self, on_progress: Optional[ProgressCallback] = None) -> None:
         """Process extracted data and generate insights.
@@ -336,142 +565,122 @@ class Orchestrator:
         # Get LLM provider
         provider = get_provider(self.config.llm)
 
-        # Process each user's data
-        for file_idx, raw_file in enumerate(raw_files):
-            # Extract username and year from filename: {username}_{year}_raw.json
-            stem = raw_file.stem  # e.g., "detour1999_2024_raw"
-            if stem.endswith("_raw"):
-                stem = stem[:-4]  # Remove "_raw" suffix
-
-            # Extract username (everything before last underscore which should be year)
-            parts = stem.rsplit("_", 1)
-            if len(parts) == 2 and parts[1].isdigit():
-                username = parts[0]
-                file_year = parts[1]
-            else:
-                # Fallback for old format files without year
-                username = stem
-                file_year = str(self.config.year)
+        # Stats for each user are independent and CPU-bound, so compute them in parallel
+        year = self.config.year
+        processed: list[tuple[str, str, dict[str, Any]]] = []
+        if len(raw_files) > 1:
+            max_workers = min(len(raw_files), os.cpu_count() or 1)
+            # Spawned rather than forked: this often runs on the TUI's worker thread,
+            # and forking a multi-threaded process can deadlock the children
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results = executor.map(
+                    _process_raw_file, raw_files, repeat(year), repeat(self.output_dir)
+                )
+                for file_idx, result in enumerate(results):
+                    self._report_processed(file_idx, len(raw_files), result, on_progress)
+                    processed.append(result)
+        else:
+            result = _process_raw_file(raw_files[0], year, self.output_dir)
+            self._report_processed(0, 1, result, on_progress)
+            processed.append(result)
+
+        # Generate AI content for all users at once if provider is not "none"
+        if self.config.llm.provider != "none":
+            asyncio.run(self._generate_ai_content(provider, processed, on_progress))
+
+        # Save processed data
+        option = orjson.OPT_NON_STR_KEYS
+        if self.config.pretty_json:
+            option |= orjson.OPT_INDENT_2
+        for username, file_year, stats in processed:
+            processed_file = data_dir / f"{username}_{file_year}_processed.json"
+            processed_file.write_bytes(orjson.dumps(stats, default=str, option=option))
 
-            msg = f"Processing user {file_idx + 1}/{len(raw_files)}: {username} ({file_year})"
-            console.print(msg)
-            if on_progress:
-                on_progress(msg)
+            console.print(f"  [green]Saved processed data to {processed_file}[/green]")
 
-            # Load raw history
-            with open(raw_file) as f:
-                history_data = json.load(f)
-
-            from plex_wrapped.extractors.plex import ListeningHistory
-
-            history = ListeningHistory(**history_data)
-
-            # Build image mapping from downloaded images
-            image_mapping = self._build_image_mapping(username)
-
-            # Generate stats
-            stats_processor = StatsProcessor(history)
-            time_processor = TimeAnalysisProcessor(history)
-
-            # Build stats with local image URLs where available
-            top_artists = []
-            for item in stats_processor.top_artists(10):
-                artist_key = f"artist:{slugify(item.name)}"
-                image_url = image_mapping.get(artist_key, item.image_url)
-                top_artists.append({
-                    "name": item.name,
-                    "plays": item.plays,
-                    "minutes": item.minutes,
-                    "image_url": image_url,
-                })
-
-            top_tracks = []
-            for item in stats_processor.top_tracks(10):
-                track_key = f"track:{slugify(item.artist or '')}-{slugify(item.name)}"
-                album_key = f"album:{slugify(item.artist or '')}-{slugify(item.album or '')}"
-                image_url = image_mapping.get(track_key) or image_mapping.get(album_key) or item.image_url
-                top_tracks.append({
-                    "name": item.name,
-                    "artist": item.artist,
-                    "album": item.album,
-                    "plays": item.plays,
-                    "minutes": item.minutes,
-                    "image_url": image_url,
-                })
-
-            top_albums = []
-            for item in stats_processor.top_albums(10):
-                album_key = f"album:{slugify(item.artist or '')}-{slugify(item.name)}"
-                image_url = image_mapping.get(album_key, item.image_url)
-                top_albums.append({
-                    "name": item.name,
-                    "artist": item.artist,
-                    "plays": item.plays,
-                    "minutes": item.minutes,
-                    "image_url": image_url,
-                })
-
-            stats = {
-                "user": username,
-                "year": self.config.year,
-                "total": stats_processor.total_stats(),
-                "top_artists": top_artists,
-                "top_tracks": top_tracks,
-                "top_albums": top_albums,
-                "time_analysis": {
-                    "plays_by_hour": time_processor.plays_by_hour(),
-                    "plays_by_day_of_week": time_processor.plays_by_day_of_week(),
-                    "plays_by_month": time_processor.plays_by_month(),
-                    "peak_listening_hour": time_processor.peak_listening_hour(),
-                    "peak_listening_day": time_processor.peak_listening_day(),
-                    "peak_day_overall": time_processor.peak_day_overall(),
-                    "longest_streak": time_processor.longest_streak(),
-                    "late_night_anthem": time_processor.late_night_anthem(),
-                    "most_repeated_single_day": time_processor.most_repeated_single_day(),
-                },
-            }
-
-            # Generate AI content if provider is not "none"
-            if self.config.llm.provider != "none":
-                console.print(f"  Generating AI insights for {username}...")
-                if on_progress:
-                    on_progress(f"  Generating AI insights for {username}...")
-
-                generators = [
-                    ("narrative", NarrativeGenerator(provider)),
-                    ("personality", PersonalityGenerator(provider)),
-                    ("roast", RoastGenerator(provider)),
-                    ("aura", AuraGenerator(provider)),
-                    ("superlatives", SuperlativesGenerator(provider)),
-                    ("hot_takes", HotTakesGenerator(provider)),
-                    ("suggestions", SuggestionsGenerator(provider)),
-                    ("theme", ThemeGenerator(provider)),
-                ]
-
-                ai_content = {}
-                for gen_idx, (name, generator) in enumerate(generators):
-                    if on_progress:
-                        on_progress(f"    Generating {name} ({gen_idx + 1}/{len(generators)})...")
-                    try:
-                        result = generator.generate(stats)
-                        ai_content[name] = result
-                    except Exception as e:
-                        console.print(f"  [yellow]Warning: Failed to generate {name}: {e}[/yellow]")
-                        if on_progress:
-                            on_progress(f"    Warning: Failed to generate {name}: {e}")
-                        ai_content[name] = {}
+    async def _generate_ai_content(
+        self,
+        provider: LLMProvider,
+        processed: list[tuple[str, str, dict[str, Any]]],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Run the AI generators for every user concurrently.
 
-                stats["ai_content"] = ai_content
+        Each user costs two requests: one composite request covering all text
+        sections and one for the visual theme. Requests are dispatched together
+        with asyncio.gather and paced by a RateLimiter that keeps them under the
+        provider's request and token limits, adapting concurrency (up to
+        ``llm.max_concurrency``) when the provider pushes back. Results are
+        stored on each user's stats under "ai_content".
 
-            # Save processed data
-            processed_file = data_dir / f"{username}_{file_year}_processed.json"
-            with open(processed_file, "w") as f:
-                json.dump(stats, f, indent=2, default=str)
+        Args:
+            provider: LLM provider shared by all generators
+            processed: List of (username, year, stats) tuples to enrich in place
+            on_progress: Optional callback for progress updates
+        """
+        llm = self.config.llm
+        defaults = PROVIDER_LIMITS.get(llm.provider, RateLimits())
+        limits = RateLimits(
+            requests_per_minute=llm.requests_per_minute or defaults.requests_per_minute,
+            tokens_per_minute=llm.tokens_per_minute or defaults.tokens_per_minute,
+        )
+        provider = RateLimitedProvider(
+            provider,
+            RateLimiter(limits, llm.max_concurrency),
+            max_retries=llm.max_retries,
+            request_timeout=llm.request_timeout,
+        )
 
-            console.print(f"  [green]Saved processed data to {processed_file}[/green]")
+        cache = ResponseCache(self.output_dir / "cache" / "llm") if llm.cache else None
+        generators = [
+            ("insights", CompositeGenerator(provider, cache)),
+            ("theme", ThemeGenerator(provider, cache)),
+        ]
 
-    def build(self) -> None:
-        """Build the frontend application with processed data."""
+        async def run(
+            username: str, name: str, generator: BaseGenerator, stats: dict[str, Any]
+        ) -> dict[str, Any]:
+            if on_progress:
+                on_progress(f"    Generating {name} for {username}...")
+            try:
+                return await generator.generate(stats)
+            except Exception as e:
+                console.print(
+                    f"  [yellow]Warning: Failed to generate {name} for {username}: {e}[/yellow]"
+                )
+                if on_progress:
+                    on_progress(f"    Warning: Failed to generate {name} for {username}: {e}")
+                return {}
+
+        msg = f"  Generating AI insights for {len(processed)} user(s)..."
+        console.print(msg)
+        if on_progress:
+            on_progress(msg)
+
+        jobs = [
+            (username, name, generator, stats)
+            for username, _, stats in processed
+            for name, generator in generators
+        ]
+        results = await asyncio.gather(*(run(*job) for job in jobs))
+
+        for (_, name, _, stats), result in zip(jobs, results):
+            ai_content = stats.setdefault("ai_content", {})
+            if name == "insights":
+                # Composite result is keyed by section; a failed request leaves each empty
+                for section in CompositeGenerator.SECTIONS:
+                    ai_content[section] = result.get(section, {})
+            else:
+                ai_content[name] = result
+
+    def build(self, on_progress: Optional[ProgressCallback] = None) -> None:
+        """Build the frontend application with processed data.
+
+        Args:
+            on_progress: Optional callback receiving each line of build output
+        """
         console.print("[bold blue]Building frontend application...[/bold blue]")
 
         # Check for frontend directory
@@ -484,17 +693,10 @@ class Orchestrator:
 
         # Run npm build
         try:
-            result = subprocess.run(
-                ["npm", "run", "build"],
-                cwd=frontend_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            self._run_command(["npm", "run", "build"], cwd=frontend_dir, on_progress=on_progress)
             console.print("[green]Frontend build completed successfully[/green]")
         except subprocess.CalledProcessError as e:
-            console.print(f"[red]Build failed:[/red]\n{e.stderr}")
-            raise RuntimeError(f"Frontend build failed: {e.stderr}") from e
+            raise RuntimeError(f"Frontend build failed: {e.output}") from e
 
         # Copy images from output directory to frontend dist
         images_src = self.output_dir / "images"
@@ -507,8 +709,12 @@ class Orchestrator:
             shutil.copytree(images_src, images_dst)
             console.print(f"[green]Copied images to {images_dst}[/green]")
 
-    def deploy(self) -> None:
-        """Deploy the built application to hosting provider."""
+    def deploy(self, on_progress: Optional[ProgressCallback] = None) -> None:
+        """Deploy the built application to hosting provider.
+
+        Args:
+            on_progress: Optional callback receiving each line of deploy output
+        """
         console.print("[bold blue]Deploying to hosting provider...[/bold blue]")
 
         provider = self.config.hosting.provider
@@ -526,17 +732,19 @@ class Orchestrator:
             )
 
         if provider == "cloudflare":
-            self._deploy_cloudflare(dist_dir)
+            self._deploy_cloudflare(dist_dir, on_progress)
         elif provider == "vercel":
-            self._deploy_vercel(dist_dir)
+            self._deploy_vercel(dist_dir, on_progress)
         elif provider == "netlify":
-            self._deploy_netlify(dist_dir)
+            self._deploy_netlify(dist_dir, on_progress)
         elif provider == "github":
-            self._deploy_github(dist_dir)
+            self._deploy_github(dist_dir, on_progress)
         else:
             raise ValueError(f"Unsupported hosting provider: {provider}")
 
-    def _deploy_cloudflare(self, dist_dir: Path) -> None:
+    def _deploy_cloudflare(
+        self, dist_dir: Path, on_progress: Optional[ProgressCallback] = None
+    ) -> None:
         """Deploy to Cloudflare Pages."""
         if not self.config.hosting.cloudflare:
             raise RuntimeError("Cloudflare config is missing")
@@ -561,12 +769,14 @@ class Orchestrator:
             env["CLOUDFLARE_API_TOKEN"] = config.api_token
 
         try:
-            subprocess.run(cmd, check=True, env=env)
+            self._run_command(cmd, env=env, on_progress=on_progress)
             console.print("[green]Deployed to Cloudflare Pages successfully[/green]")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Cloudflare deployment failed: {e}") from e
 
-    def _deploy_vercel(self, dist_dir: Path) -> None:
+    def _deploy_vercel(
+        self, dist_dir: Path, on_progress: Optional[ProgressCallback] = None
+    ) -> None:
         """Deploy to Vercel."""
         if not self.config.hosting.vercel:
             raise RuntimeError("Vercel config is missing")
@@ -583,12 +793,14 @@ class Orchestrator:
             env["VERCEL_TOKEN"] = config.token
 
         try:
-            subprocess.run(cmd, check=True, env=env)
+            self._run_command(cmd, env=env, on_progress=on_progress)
             console.print("[green]Deployed to Vercel successfully[/green]")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Vercel deployment failed: {e}") from e
 
-    def _deploy_netlify(self, dist_dir: Path) -> None:
+    def _deploy_netlify(
+        self, dist_dir: Path, on_progress: Optional[ProgressCallback] = None
+    ) -> None:
         """Deploy to Netlify."""
         if not self.config.hosting.netlify:
             raise RuntimeError("Netlify config is missing")
@@ -614,12 +826,14 @@ class Orchestrator:
             env["NETLIFY_AUTH_TOKEN"] = config.auth_token
 
         try:
-            subprocess.run(cmd, check=True, env=env)
+            self._run_command(cmd, env=env, on_progress=on_progress)
             console.print("[green]Deployed to Netlify successfully[/green]")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Netlify deployment failed: {e}") from e
 
-    def _deploy_github(self, dist_dir: Path) -> None:
+    def _deploy_github(
+        self, dist_dir: Path, on_progress: Optional[ProgressCallback] = None
+    ) -> None:
         """Deploy to GitHub Pages."""
         if not self.config.hosting.github:
             raise RuntimeError("GitHub Pages config is missing")
@@ -638,11 +852,61 @@ class Orchestrator:
         ]
 
         try:
-            subprocess.run(cmd, check=True)
+            self._run_command(cmd, on_progress=on_progress)
             console.print("[green]Deployed to GitHub Pages successfully[/green]")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"GitHub Pages deployment failed: {e}") from e
 
+    def _run_command(
+        self,
+        cmd: list[str],
+        cwd: Optional[Path] = None,
+        env: Optional[dict[str, str]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        """Run a command to completion, streaming its output as it is produced.
+
+        Args:
+            cmd: Command and arguments
+            cwd: Working directory for the command
+            env: Environment for the command (None inherits ours)
+            on_progress: Optional callback receiving each output line
+
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero; output
+                holds the last lines it printed
+        """
+        asyncio.run(self._stream_command(cmd, cwd, env, on_progress))
+
+    async def _stream_command(
+        self,
+        cmd: list[str],
+        cwd: Optional[Path],
+        env: Optional[dict[str, str]],
+        on_progress: Optional[ProgressCallback],
+    ) -> None:
+        """Async body of _run_command, reading stdout and stderr as one stream."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        # Keep only the tail for error messages instead of buffering everything
+        tail: deque[str] = deque(maxlen=50)
+        assert process.stdout is not None
+        async for raw_line in process.stdout:
+            line = raw_line.decode(errors="replace").rstrip()
+            tail.append(line)
+            console.print(f"  {escape(line)}", highlight=False)
+            if on_progress:
+                on_progress(escape(line))
+
+        returncode = await process.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd, output="\n".join(tail))
+
     def run_all(self) -> None:
         """Run the complete workflow: extract, process, build, and deploy."""
         console.print(
@@ -1,14 +1,16 @@
 # ABOUTME: Stats processor for calculating top tracks, artists, and albums.
 # ABOUTME: Aggregates listening history data and ranks by play count.
 
+import heapq
+from collections.abc import Sequence
 from dataclasses import dataclass
-from collections import Counter
+from functools import cached_property
 from typing import Any
 
 from plex_wrapped.extractors.plex import ListeningHistory
 
 
-@dataclass
+@dataclass(slots=True)
 class TopItem:
     """Represents a top item (track, artist, or album) with stats."""
 
@@ -20,6 +22,56 @@ class TopItem:
     image_url: str | None = None
 
 
+@dataclass(slots=True)
+class _KeyTotals:
+    """Play counts and total duration per distinct key, keys in first-play order.
+
+    Keys are factorized to integer codes so totals accumulate into flat lists
+    instead of hashing each key again per play.
+    """
+
+    keys: list[Any]
+    plays: list[int]
+    total_ms: list[int]
+    # Row index of each key's first play in the history's columns
+    first_row: list[int]
+
+    @classmethod
+    def from_columns(cls, keys: list[Any], durations_ms: Sequence[int]) -> "_KeyTotals":
+        """Group parallel key and duration columns.
+
+        Args:
+            keys: Grouping key for each play
+            durations_ms: Duration of each play in milliseconds
+
+        Returns:
+            _KeyTotals with one entry per distinct key
+        """
+        index: dict[Any, int] = {}
+        codes = [index.setdefault(key, len(index)) for key in keys]
+        plays = [0] * len(index)
+        total_ms = [0] * len(index)
+        for code, duration_ms in zip(codes, durations_ms):
+            plays[code] += 1
+            total_ms[code] += duration_ms
+
+        # Walking the rows backwards leaves each code mapped to its earliest row
+        first_rows = dict(zip(reversed(codes), range(len(codes) - 1, -1, -1)))
+        first_row = [first_rows[code] for code in range(len(index))]
+        return cls(keys=list(index), plays=plays, total_ms=total_ms, first_row=first_row)
+
+    def top(self, limit: int) -> list[int]:
+        """Codes of the most played keys, ties broken by first play.
+
+        Args:
+            limit: Maximum number of codes to return
+
+        Returns:
+            Up to limit codes sorted by play count (descending)
+        """
+        return heapq.nlargest(limit, range(len(self.keys)), key=self.plays.__getitem__)
+
+
 class StatsProcessor:
     """Processes listening history to generate statistics."""
 
@@ -27,6 +79,28 @@ class StatsProcessor:
         """Initialize with listening history data."""
         self.history = history
 
+    @cached_property
+    def _artists(self) -> _KeyTotals:
+        """Play and duration totals per artist."""
+        columns = self.history.columns
+        return _KeyTotals.from_columns(columns.artist, columns.duration_ms)
+
+    @cached_property
+    def _tracks(self) -> _KeyTotals:
+        """Play and duration totals per (title, artist)."""
+        columns = self.history.columns
+        return _KeyTotals.from_columns(
+            list(zip(columns.title, columns.artist)), columns.duration_ms
+        )
+
+    @cached_property
+    def _albums(self) -> _KeyTotals:
+        """Play and duration totals per (album, artist)."""
+        columns = self.history.columns
+        return _KeyTotals.from_columns(
+            list(zip(columns.album, columns.artist)), columns.duration_ms
+        )
+
     def top_artists(self, limit: int = 10) -> list[TopItem]:
         """Get top artists by play count.
 
@@ -36,32 +110,21 @@ class StatsProcessor:
         Returns:
             List of TopItem objects sorted by play count (descending)
         """
-        artist_plays = Counter(track.artist for track in self.history.tracks)
-        artist_minutes: dict[str, float] = {}
-        artist_images: dict[str, str | None] = {}
-
-        for track in self.history.tracks:
-            artist = track.artist
-            artist_minutes[artist] = artist_minutes.get(artist, 0.0) + track.duration_minutes
-
-            # Store first thumb_url we see for each artist
-            if artist not in artist_images:
-                artist_images[artist] = track.thumb_url
-
-        top_items = [
+        artists = self._artists
+        thumb_urls = self.history.columns.thumb_url
+        return [
             TopItem(
-                name=artist,
-                plays=plays,
-                minutes=artist_minutes[artist],
+                name=artists.keys[code],
+                plays=artists.plays[code],
+                minutes=artists.total_ms[code] / 60000.0,
                 artist=None,
                 album=None,
-                image_url=artist_images.get(artist),
+                # First thumb_url we saw for the artist
+                image_url=thumb_urls[artists.first_row[code]],
             )
-            for artist, plays in artist_plays.most_common(limit)
+            for code in artists.top(limit)
         ]
 
-        return top_items
-
     def top_tracks(self, limit: int = 10) -> list[TopItem]:
         """Get top tracks by play count.
 
@@ -71,33 +134,22 @@ class StatsProcessor:
         Returns:
             List of TopItem objects sorted by play count (descending)
         """
-        track_key_plays: Counter[tuple[str, str]] = Counter()
-        track_info: dict[tuple[str, str], dict[str, Any]] = {}
-
-        for track in self.history.tracks:
-            key = (track.title, track.artist)
-            track_key_plays[key] += 1
-
-            if key not in track_info:
-                track_info[key] = {
-                    "album": track.album,
-                    "duration_minutes": track.duration_minutes,
-                    "thumb_url": track.thumb_url,
-                }
-
+        tracks = self._tracks
+        columns = self.history.columns
         top_items = []
-        for (title, artist), plays in track_key_plays.most_common(limit):
-            info = track_info[(title, artist)]
-            minutes = info["duration_minutes"] * plays
-
+        for code in tracks.top(limit):
+            title, artist = tracks.keys[code]
+            plays = tracks.plays[code]
+            # Album, duration, and artwork come from the track's first play
+            row = tracks.first_row[code]
             top_items.append(
                 TopItem(
                     name=title,
                     plays=plays,
-                    minutes=minutes,
+                    minutes=columns.duration_ms[row] / 60000.0 * plays,
                     artist=artist,
-                    album=info["album"],
-                    image_url=info["thumb_url"],
+                    album=columns.album[row],
+                    image_url=columns.thumb_url[row],
                 )
             )
 
@@ -112,30 +164,22 @@ class StatsProcessor:
         Returns:
             List of TopItem objects sorted by play count (descending)
         """
-        album_key_plays: Counter[tuple[str, str]] = Counter()
-        album_minutes: dict[tuple[str, str], float] = {}
-        album_images: dict[tuple[str, str], str | None] = {}
-
-        for track in self.history.tracks:
-            key = (track.album, track.artist)
-            album_key_plays[key] += 1
-            album_minutes[key] = album_minutes.get(key, 0.0) + track.duration_minutes
-
-            # Store first thumb_url we see for each album
-            if key not in album_images:
-                album_images[key] = track.thumb_url
-
-        top_items = [
-            TopItem(
-                name=album,
-                plays=plays,
-                minutes=album_minutes[(album, artist)],
-                artist=artist,
-                album=None,
-                image_url=album_images.get((album, artist)),
+        albums = self._albums
+        thumb_urls = self.history.columns.thumb_url
+        top_items = []
+        for code in albums.top(limit):
+            album, artist = albums.keys[code]
+            top_items.append(
+                TopItem(
+                    name=album,
+                    plays=albums.plays[code],
+                    minutes=albums.total_ms[code] / 60000.0,
+                    artist=artist,
+                    album=None,
+                    # First thumb_url we saw for the album
+                    image_url=thumb_urls[albums.first_row[code]],
+                )
             )
-            for (album, artist), plays in album_key_plays.most_common(limit)
-        ]
 
         return top_items
 
@@ -150,17 +194,10 @@ class StatsProcessor:
                 - unique_albums: Number of unique albums
                 - unique_tracks: Number of unique tracks
         """
-        total_tracks = len(self.history.tracks)
-        total_minutes = sum(track.duration_minutes for track in self.history.tracks)
-
-        unique_artists = len({track.artist for track in self.history.tracks})
-        unique_albums = len({track.album for track in self.history.tracks})
-        unique_tracks = len({(track.title, track.artist) for track in self.history.tracks})
-
         return {
-            "total_tracks": total_tracks,
-            "total_minutes": total_minutes,
-            "unique_artists": unique_artists,
-            "unique_albums": unique_albums,
-            "unique_tracks": unique_tracks,
+            "total_tracks": self.history.total_tracks,
+            "total_minutes": self.history.total_minutes,
+            "unique_artists": len(self._artists.keys),
+            "unique_albums": len(set(self.history.columns.album)),
+            "unique_tracks": len(self._tracks.keys),
         }
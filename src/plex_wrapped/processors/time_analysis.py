@@ -2,100 +2,179 @@
 # ABOUTME: Analyzes plays by hour, day, month and identifies quirky temporal stats.
 
 from collections import Counter
-from datetime import datetime
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from itertools import compress
 
 from plex_wrapped.extractors.plex import ListeningHistory
 
 
+def _bincount(column: bytes, size: int) -> list[int]:
+    """Count occurrences of each value 0..size-1 in a byte column.
+
+    bytes.count is a C-level scan, so a handful of passes over the column
+    beats hashing every play into a Counter.
+    """
+    return [column.count(value) for value in range(size)]
+
+
+def _mode(column: bytes, counts: list[int]) -> int:
+    """Most frequent value in a byte column, ties going to the earliest seen.
+
+    Args:
+        column: Byte column the counts were taken from
+        counts: Occurrences of each value, as returned by _bincount
+
+    Returns:
+        The most frequent value
+    """
+    top = max(counts)
+    return min(
+        (value for value, count in enumerate(counts) if count == top),
+        key=column.index,
+    )
+
+
+def _mask(column: bytes, selected: Iterable[int]) -> bytes:
+    """One byte per play, 1 where the column's value is selected and 0 elsewhere."""
+    table = bytearray(256)
+    for value in selected:
+        table[value] = 1
+    return column.translate(table)
+
+
+@dataclass(slots=True)
+class _TimeColumns:
+    """Calendar components of every play, extracted once as parallel columns.
+
+    Hours, weekdays and months each fit in a byte, so they are kept as compact
+    bytes columns that can be counted and masked at C speed.
+    """
+
+    hours: bytes
+    weekdays: bytes
+    months: bytes
+    # Proleptic Gregorian ordinals, so consecutive days differ by exactly 1
+    days: list[int]
+
+
 class TimeAnalysisProcessor:
     """Analyzes temporal patterns in listening history."""
 
     def __init__(self, history: ListeningHistory) -> None:
         self.history = history
 
+    @cached_property
+    def _time(self) -> _TimeColumns:
+        """Split every play's timestamp into calendar components in one pass."""
+        played_at = self.history.columns.played_at
+        return _TimeColumns(
+            hours=bytes([ts.hour for ts in played_at]),
+            weekdays=bytes([ts.weekday() for ts in played_at]),
+            months=bytes([ts.month for ts in played_at]),
+            days=[ts.toordinal() for ts in played_at],
+        )
+
+    @cached_property
+    def _track_codes(self) -> tuple[list[tuple[str, str]], list[int]]:
+        """Distinct (title, artist) keys and each play's integer code into them.
+
+        Codes are parallel to the time columns, so filtering and counting them
+        hashes small ints instead of string tuples.
+        """
+        columns = self.history.columns
+        index: dict[tuple[str, str], int] = {}
+        codes = [
+            index.setdefault(key, len(index))
+            for key in zip(columns.title, columns.artist)
+        ]
+        return list(index), codes
+
+    def _top_track_where(self, mask: Iterable[bool]) -> tuple[tuple[str, str], int] | None:
+        """Most played (title, artist) among plays selected by a mask.
+
+        Args:
+            mask: One flag per play, parallel to the time columns
+
+        Returns:
+            ((title, artist), plays) or None if no play is selected
+        """
+        keys, codes = self._track_codes
+        code_counts = Counter(compress(codes, mask))
+        if not code_counts:
+            return None
+
+        code, play_count = code_counts.most_common(1)[0]
+        return keys[code], play_count
+
+    @cached_property
+    def _hour_counts(self) -> list[int]:
+        """Plays per hour of day, shared by plays_by_hour and peak_listening_hour."""
+        return _bincount(self._time.hours, 24)
+
+    @cached_property
+    def _weekday_counts(self) -> list[int]:
+        """Plays per weekday, shared by plays_by_day_of_week and peak_listening_day."""
+        return _bincount(self._time.weekdays, 7)
+
+    @cached_property
+    def _day_counts(self) -> Counter[int]:
+        """Plays per calendar day, shared by peak_day_overall and longest_streak."""
+        return Counter(self._time.days)
+
     def plays_by_hour(self) -> list[int]:
         """Count plays per hour of day (0-23)."""
-        hour_counts = Counter(track.played_at.hour for track in self.history.tracks)
-        return [hour_counts.get(hour, 0) for hour in range(24)]
+        return list(self._hour_counts)
 
     def plays_by_day_of_week(self) -> list[int]:
         """Count plays per day of week (0=Monday, 6=Sunday)."""
-        day_counts = Counter(
-            track.played_at.weekday() for track in self.history.tracks
-        )
-        return [day_counts.get(day, 0) for day in range(7)]
+        return list(self._weekday_counts)
 
     def plays_by_month(self) -> list[int]:
         """Count plays per month (1-12)."""
-        month_counts = Counter(track.played_at.month for track in self.history.tracks)
-        return [month_counts.get(month, 0) for month in range(1, 13)]
+        return _bincount(self._time.months, 13)[1:]
 
     def peak_listening_hour(self) -> int:
         """Find hour with most plays."""
-        hour_counts = Counter(track.played_at.hour for track in self.history.tracks)
-        return hour_counts.most_common(1)[0][0] if hour_counts else 0
+        hours = self._time.hours
+        return _mode(hours, self._hour_counts) if hours else 0
 
     def peak_listening_day(self) -> int:
         """Find day of week with most plays (0=Monday, 6=Sunday)."""
-        day_counts = Counter(
-            track.played_at.weekday() for track in self.history.tracks
-        )
-        return day_counts.most_common(1)[0][0] if day_counts else 0
+        weekdays = self._time.weekdays
+        return _mode(weekdays, self._weekday_counts) if weekdays else 0
 
     def peak_day_overall(self) -> dict:
         """Find the single date with most plays."""
-        date_counts = Counter(
-            track.played_at.date() for track in self.history.tracks
-        )
+        date_counts = self._day_counts
         if not date_counts:
             return {"date": None, "plays": 0}
 
-        most_common_date, play_count = date_counts.most_common(1)[0]
+        most_common_day, play_count = date_counts.most_common(1)[0]
         return {
-            "date": most_common_date.isoformat(),
+            "date": date.fromordinal(most_common_day).isoformat(),
             "plays": play_count,
         }
 
     def longest_streak(self) -> int:
         """Find longest consecutive days with at least one play."""
-        if not self.history.tracks:
-            return 0
-
-        # Get all unique dates sorted
-        dates = sorted(set(track.played_at.date() for track in self.history.tracks))
-
-        if not dates:
-            return 0
-
-        max_streak = 1
-        current_streak = 1
-
-        for i in range(1, len(dates)):
-            days_diff = (dates[i] - dates[i - 1]).days
-            if days_diff == 1:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
-
-        return max_streak
+        # Within a run of consecutive days, day minus its position in the sorted
+        # unique days is constant, and it grows across every gap, so each offset
+        # identifies exactly one streak and its count is the streak length.
+        # The distinct days are already the day counter's keys (at most 366)
+        days = sorted(self._day_counts)
+        streaks = Counter(day - position for position, day in enumerate(days))
+        return max(streaks.values(), default=0)
 
     def late_night_anthem(self) -> dict | None:
         """Find most played track between midnight and 4am."""
-        late_night_tracks = [
-            track
-            for track in self.history.tracks
-            if 0 <= track.played_at.hour < 4
-        ]
-
-        if not late_night_tracks:
+        top = self._top_track_where(_mask(self._time.hours, range(4)))
+        if top is None:
             return None
 
-        track_counts = Counter(
-            (track.title, track.artist) for track in late_night_tracks
-        )
-        most_common, play_count = track_counts.most_common(1)[0]
-        title, artist = most_common
+        (title, artist), play_count = top
 
         return {
             "track": title,
@@ -105,18 +184,11 @@ class TimeAnalysisProcessor:
 
     def day_anthem(self, day_of_week: int) -> dict | None:
         """Find most played track on specific day of week (0=Monday, 6=Sunday)."""
-        day_tracks = [
-            track
-            for track in self.history.tracks
-            if track.played_at.weekday() == day_of_week
-        ]
-
-        if not day_tracks:
+        top = self._top_track_where(_mask(self._time.weekdays, [day_of_week]))
+        if top is None:
             return None
 
-        track_counts = Counter((track.title, track.artist) for track in day_tracks)
-        most_common, play_count = track_counts.most_common(1)[0]
-        title, artist = most_common
+        (title, artist), play_count = top
 
         day_names = [
             "Monday",
@@ -137,24 +209,19 @@ class TimeAnalysisProcessor:
 
     def most_repeated_single_day(self) -> dict | None:
         """Find the track played most times on a single day."""
-        if not self.history.tracks:
-            return None
-
-        # Group tracks by (date, title, artist)
-        day_track_counts: Counter = Counter()
-        for track in self.history.tracks:
-            key = (track.played_at.date(), track.title, track.artist)
-            day_track_counts[key] += 1
+        # Group plays by (day, (title, artist))
+        keys, codes = self._track_codes
+        day_track_counts = Counter(zip(self._time.days, codes))
 
         if not day_track_counts:
             return None
 
-        most_common, play_count = day_track_counts.most_common(1)[0]
-        date, title, artist = most_common
+        (day, code), play_count = day_track_counts.most_common(1)[0]
+        title, artist = keys[code]
 
         return {
             "track": title,
             "artist": artist,
-            "date": date.isoformat(),
+            "date": date.fromordinal(day).isoformat(),
             "plays": play_count,
         }
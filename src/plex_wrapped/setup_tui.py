@@ -1,28 +1,209 @@
 # ABOUTME: Interactive TUI setup wizard for Plex Wrapped configuration using Textual.
 # ABOUTME: Multi-screen wizard with validation for Plex, LLM, and hosting configuration.
 
+import asyncio
+import hashlib
+import importlib
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 
-import anthropic
-import openai
-import yaml
-from plexapi.server import PlexServer
+import orjson
+from rich.table import Table
 from rich.text import Text
 from textual import on, work
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.screen import Screen
+from textual.timer import Timer
+from textual.validation import Integer
 from textual.widgets import Button, Footer, Header, Input, Label, RadioButton, RadioSet, RichLog, Static
 
-from plex_wrapped.extractors.plex import PlexExtractor
+if TYPE_CHECKING:
+    # The Plex and LLM SDKs, and yaml, are imported where they're used so the
+    # wizard paints its first screen without loading them
+    import requests
+
+# Successful credential checks are remembered for a while so pressing Test/Validate
+# again, or coming Back to a screen, doesn't repeat the network round-trip
+VALIDATION_TTL_SECONDS = 300.0
+_validation_cache: dict[str, tuple[Any, float]] = {}
+
+
+def _credentials_key(*parts: str) -> str:
+    """Hash credentials into a cache key so secrets aren't held as dict keys."""
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _get_cached_validation(key: str) -> Optional[Any]:
+    """Return the remembered result of a successful check, or None if expired/missing."""
+    entry = _validation_cache.get(key)
+    if entry is None:
+        return None
+    result, expires_at = entry
+    if time.monotonic() >= expires_at:
+        del _validation_cache[key]
+        return None
+    return result
+
+
+def _cache_validation(key: str, result: Any) -> None:
+    """Remember the result of a successful check for VALIDATION_TTL_SECONDS."""
+    _validation_cache[key] = (result, time.monotonic() + VALIDATION_TTL_SECONDS)
+
+
+# Hashed credentials that passed a check are also kept on disk, so reopening the
+# wizard with an unchanged config.yaml doesn't need to test them again
+VALIDATION_MARKER_TTL_SECONDS = 7 * 24 * 60 * 60.0
+VALIDATION_MARKERS_PATH = Path.home() / ".cache" / "plex-wrapped" / "validated.json"
+
+
+def _load_validation_markers() -> dict[str, float]:
+    """Read unexpired validation markers (credential key -> expiry as a Unix time)."""
+    try:
+        markers = orjson.loads(VALIDATION_MARKERS_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(markers, dict):
+        return {}
+    now = time.time()
+    return {
+        key: expires_at
+        for key, expires_at in markers.items()
+        if isinstance(expires_at, (int, float)) and expires_at > now
+    }
+
+
+def _is_marked_validated(key: str) -> bool:
+    """Check whether these credentials passed a check in a recent session."""
+    return key in _load_validation_markers()
+
+
+def _mark_validated(key: str) -> None:
+    """Record a successful check on disk (blocking; failures to write are ignored)."""
+    markers = _load_validation_markers()
+    markers[key] = time.time() + VALIDATION_MARKER_TTL_SECONDS
+    try:
+        VALIDATION_MARKERS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = VALIDATION_MARKERS_PATH.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(markers))
+        tmp_path.replace(VALIDATION_MARKERS_PATH)
+    except OSError:
+        pass
+
+
+# HTTP clients reused across checks so repeat attempts keep their open connections
+_plex_session: Optional["requests.Session"] = None
+_llm_clients: dict[str, Any] = {}
+
+
+def _get_plex_session() -> "requests.Session":
+    """Get the session shared by every Plex connection test."""
+    global _plex_session
+    if _plex_session is None:
+        import requests
+
+        _plex_session = requests.Session()
+    return _plex_session
+
+
+def _get_llm_client(provider: str, api_key: str) -> Any:
+    """Get the async SDK client for a provider and key, creating it on first use."""
+    key = _credentials_key("llm", provider, api_key)
+    client = _llm_clients.get(key)
+    if client is None:
+        if provider == "anthropic":
+            import anthropic
+
+            client = anthropic.AsyncAnthropic(api_key=api_key)
+        else:
+            import openai
+
+            client = openai.AsyncOpenAI(api_key=api_key)
+        _llm_clients[key] = client
+    return client
+
+
+def _fetch_plex_users(url: str, token: str) -> list[str]:
+    """Connect to a Plex server and list its users (blocking)."""
+    from plex_wrapped.extractors.plex import PlexExtractor
+
+    extractor = PlexExtractor(url, token, session=_get_plex_session())
+    extractor.connect()
+    return extractor.get_users()
+
+
+# Writes the wizard's config to disk: (config path, config data) -> None
+ConfigWriter = Callable[[Path, Dict[str, Any]], None]
+
+
+def _write_config(config_path: Path, config_data: Dict[str, Any]) -> None:
+    """Write config as YAML, using libyaml's C emitter when it's available (blocking)."""
+    import yaml
+
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(config_path, "w") as f:
+        yaml.dump(config_data, f, Dumper=dumper, default_flow_style=False, sort_keys=False)
+
+
+async def _check_llm_key(provider: str, api_key: str) -> None:
+    """Authenticate an API key by listing models.
+
+    Listing models needs a valid key but doesn't run (or pay for) inference.
+    """
+    client = _get_llm_client(provider, api_key)
+    if provider == "anthropic":
+        await client.models.list(limit=1)
+    else:
+        await client.models.list()
+
+
+_MASK = "*" * 8
+
+
+def _mask_secret(value: str) -> str:
+    """Mask a secret for display, showing its last four characters only if it's long enough."""
+    return f"{_MASK}...{value[-4:]}" if len(value) >= 8 else f"{_MASK}..."
+
+
+# Status lines parsed from markup once, at import, rather than on every update
+_PLEX_TESTING = Text.from_markup("[yellow]Testing connection...[/yellow]")
+_PLEX_SUCCESS_PREFIX = Text.from_markup("[green]✓ Connection successful![/green]\n")
+_PLEX_FAIL_PREFIX = Text.from_markup("[red]✗ Connection failed:[/red]\n")
+_LLM_VALIDATING = Text.from_markup("[yellow]Validating API key...[/yellow]")
+_LLM_SUCCESS_PREFIX = Text.from_markup("[green]✓ API key validated successfully![/green]\n")
+_LLM_FAIL_PREFIX = Text.from_markup("[red]✗ Validation failed:[/red]\n")
+_INVALID_YEAR = Text("Invalid year value", style="red")
+_PREVIOUSLY_VALIDATED = Text.from_markup(
+    "[green]✓ Verified in a previous session.[/green]\nTest again if anything has changed."
+)
+
+
+class StatusScreen(Screen):
+    """Screen with a status line that only repaints when its content changes."""
+
+    _status_widget: Static
+    _last_status: str | Text = ""
+
+    def set_status(self, content: str | Text) -> None:
+        """Show markup or Text in the status line, skipping the update if it's already shown."""
+        if content != self._last_status:
+            self._last_status = content
+            self._status_widget.update(content)
+
+    def show_status(self, message: str, status_type: str) -> None:
+        """Show a plain message in the status line, red for errors and yellow otherwise."""
+        if status_type == "error":
+            self.set_status(Text(message, style="red"))
+        else:
+            self.set_status(Text(message, style="yellow"))
 
 
 class WelcomeScreen(Screen):
     """Welcome screen with project description."""
 
-    CSS = """
+    DEFAULT_CSS = """
     WelcomeScreen {
         align: center middle;
     }
@@ -76,13 +257,13 @@ class WelcomeScreen(Screen):
     @on(Button.Pressed, "#get-started")
     def go_to_plex(self) -> None:
         """Navigate to Plex configuration screen."""
-        self.app.push_screen(PlexScreen())
+        self.app.push_screen("plex")
 
 
-class PlexScreen(Screen):
+class PlexScreen(StatusScreen):
     """Plex server configuration screen."""
 
-    CSS = """
+    DEFAULT_CSS = """
     PlexScreen {
         align: center middle;
     }
@@ -94,42 +275,22 @@ class PlexScreen(Screen):
         background: $surface;
         padding: 2 4;
     }
-
-    .screen-title {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-        padding-bottom: 1;
-    }
-
-    .field-label {
-        margin-top: 1;
-        margin-bottom: 0;
-    }
-
-    .input-field {
-        width: 100%;
-        margin-bottom: 1;
-    }
-
-    #status {
-        margin-top: 1;
-        min-height: 3;
-    }
-
-    .button-row {
-        margin-top: 2;
-        width: 100%;
-        height: auto;
-    }
-
-    .button-row Button {
-        margin: 0 1;
-    }
     """
 
     def compose(self) -> ComposeResult:
         """Create Plex configuration layout."""
+        # Widgets read or updated by handlers, kept so they aren't looked up each time
+        self._url_input = Input(
+            placeholder="http://192.168.1.100:32400",
+            id="plex-url",
+            classes="input-field",
+        )
+        self._token_input = Input(
+            placeholder="Your Plex token", password=True, id="plex-token", classes="input-field"
+        )
+        self._status_widget = Static("", id="status")
+        self._next_button = Button("Next", variant="success", id="next", disabled=True)
+
         yield Header()
         yield Container(
             Static("Step 1/4: Plex Configuration", classes="screen-title"),
@@ -139,11 +300,7 @@ class PlexScreen(Screen):
                 classes="help-text",
             ),
             Label("Plex Server URL", classes="field-label"),
-            Input(
-                placeholder="http://192.168.1.100:32400",
-                id="plex-url",
-                classes="input-field",
-            ),
+            self._url_input,
             Static(
                 "[dim]To get your Plex token:\n"
                 "1. Go to app.plex.tv and sign in\n"
@@ -152,12 +309,12 @@ class PlexScreen(Screen):
                 classes="help-text",
             ),
             Label("Plex Token", classes="field-label"),
-            Input(placeholder="Your Plex token", password=True, id="plex-token", classes="input-field"),
-            Static("", id="status"),
+            self._token_input,
+            self._status_widget,
             Horizontal(
                 Button("Back", variant="default", id="back"),
                 Button("Test Connection", variant="primary", id="test"),
-                Button("Next", variant="success", id="next", disabled=True),
+                self._next_button,
                 classes="button-row",
             ),
             id="plex-container",
@@ -170,9 +327,13 @@ class PlexScreen(Screen):
         if isinstance(app, SetupApp) and "plex" in app.config_data:
             plex = app.config_data["plex"]
             if "url" in plex:
-                self.query_one("#plex-url", Input).value = plex["url"]
+                self._url_input.value = plex["url"]
             if "token" in plex:
-                self.query_one("#plex-token", Input).value = plex["token"]
+                self._token_input.value = plex["token"]
+            key = _credentials_key("plex", plex.get("url", ""), plex.get("token", ""))
+            if _is_marked_validated(key):
+                self.set_status(_PREVIOUSLY_VALIDATED)
+                self._next_button.disabled = False
 
     @on(Button.Pressed, "#back")
     def go_back(self) -> None:
@@ -182,11 +343,8 @@ class PlexScreen(Screen):
     @on(Button.Pressed, "#test")
     def test_connection(self) -> None:
         """Test Plex connection."""
-        url_input = self.query_one("#plex-url", Input)
-        token_input = self.query_one("#plex-token", Input)
-
-        url = url_input.value.strip()
-        token = token_input.value.strip()
+        url = self._url_input.value.strip()
+        token = self._token_input.value.strip()
 
         if not url or not token:
             self.show_status("Please enter both URL and token", "error")
@@ -197,41 +355,44 @@ class PlexScreen(Screen):
     @work(exclusive=True)
     async def test_plex_connection(self, url: str, token: str) -> None:
         """Test Plex connection in background worker."""
-        status = self.query_one("#status", Static)
-        next_button = self.query_one("#next", Button)
+        next_button = self._next_button
 
-        status.update("[yellow]Testing connection...[/yellow]")
+        self.set_status(_PLEX_TESTING)
         next_button.disabled = True
 
+        cache_key = _credentials_key("plex", url, token)
         try:
-            extractor = PlexExtractor(url, token)
-            extractor.connect()
-            users = extractor.get_users()
+            users = _get_cached_validation(cache_key)
+            if users is None:
+                # Blocking network calls run in a thread so the UI stays responsive
+                users = await asyncio.to_thread(_fetch_plex_users, url, token)
+                _cache_validation(cache_key, users)
+                await asyncio.to_thread(_mark_validated, cache_key)
 
             app = self.app
             if isinstance(app, SetupApp):
                 app.config_data["plex"] = {"url": url, "token": token}
 
-            status.update(
-                f"[green]✓ Connection successful![/green]\n"
-                f"Found {len(users)} user(s): {', '.join(users)}"
+            self.set_status(
+                _PLEX_SUCCESS_PREFIX + Text(f"Found {len(users)} user(s): {', '.join(users)}")
             )
             next_button.disabled = False
 
         except Exception as e:
-            status.update(f"[red]✗ Connection failed:[/red]\n{str(e)}")
+            _validation_cache.pop(cache_key, None)
+            self.set_status(_PLEX_FAIL_PREFIX + Text(str(e)))
             next_button.disabled = True
 
     @on(Button.Pressed, "#next")
     def go_to_llm(self) -> None:
         """Navigate to LLM configuration screen."""
-        self.app.push_screen(LLMScreen())
+        self.app.push_screen("llm")
 
 
-class LLMScreen(Screen):
+class LLMScreen(StatusScreen):
     """LLM provider configuration screen."""
 
-    CSS = """
+    DEFAULT_CSS = """
     LLMScreen {
         align: center middle;
     }
@@ -244,45 +405,33 @@ class LLMScreen(Screen):
         padding: 2 4;
     }
 
-    .screen-title {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-        padding-bottom: 1;
-    }
-
-    .field-label {
-        margin-top: 1;
-        margin-bottom: 0;
-    }
-
     #provider-set {
         margin: 1 0;
     }
-
-    .input-field {
-        width: 100%;
-        margin-bottom: 1;
-    }
-
-    #status {
-        margin-top: 1;
-        min-height: 3;
-    }
-
-    .button-row {
-        margin-top: 2;
-        width: 100%;
-        height: auto;
-    }
-
-    .button-row Button {
-        margin: 0 1;
-    }
     """
 
     def compose(self) -> ComposeResult:
         """Create LLM configuration layout."""
+        # Widgets read or updated by handlers, kept so they aren't looked up each time
+        self._provider_set = RadioSet(
+            RadioButton("Anthropic (Claude)", id="anthropic", value=True),
+            RadioButton("OpenAI (GPT)", id="openai"),
+            id="provider-set",
+        )
+        self._api_key_help = Static(
+            "[dim]To get your Anthropic API key:\n"
+            "1. Go to console.anthropic.com/settings/keys\n"
+            "2. Create an account if needed\n"
+            "3. Click 'Create Key' and copy it[/]",
+            id="api-key-help",
+            classes="help-text",
+        )
+        self._api_key_input = Input(
+            placeholder="Your API key", password=True, id="api-key", classes="input-field"
+        )
+        self._status_widget = Static("", id="status")
+        self._next_button = Button("Next", variant="success", id="next", disabled=True)
+
         yield Header()
         yield Container(
             Static("Step 2/4: LLM Configuration", classes="screen-title"),
@@ -292,26 +441,15 @@ class LLMScreen(Screen):
                 classes="help-text",
             ),
             Label("Choose Provider", classes="field-label"),
-            RadioSet(
-                RadioButton("Anthropic (Claude)", id="anthropic", value=True),
-                RadioButton("OpenAI (GPT)", id="openai"),
-                id="provider-set",
-            ),
-            Static(
-                "[dim]To get your Anthropic API key:\n"
-                "1. Go to console.anthropic.com/settings/keys\n"
-                "2. Create an account if needed\n"
-                "3. Click 'Create Key' and copy it[/]",
-                id="api-key-help",
-                classes="help-text",
-            ),
+            self._provider_set,
+            self._api_key_help,
             Label("API Key", classes="field-label"),
-            Input(placeholder="Your API key", password=True, id="api-key", classes="input-field"),
-            Static("", id="status"),
+            self._api_key_input,
+            self._status_widget,
             Horizontal(
                 Button("Back", variant="default", id="back"),
                 Button("Validate", variant="primary", id="validate"),
-                Button("Next", variant="success", id="next", disabled=True),
+                self._next_button,
                 classes="button-row",
             ),
             id="llm-container",
@@ -324,19 +462,22 @@ class LLMScreen(Screen):
         if isinstance(app, SetupApp) and "llm" in app.config_data:
             llm = app.config_data["llm"]
             if "api_key" in llm:
-                self.query_one("#api-key", Input).value = llm["api_key"]
+                self._api_key_input.value = llm["api_key"]
             if "provider" in llm:
                 provider = llm["provider"]
-                provider_set = self.query_one("#provider-set", RadioSet)
-                for button in provider_set.query(RadioButton):
+                for button in self._provider_set.query(RadioButton):
                     if button.id == provider:
                         button.value = True
                         break
+            key = _credentials_key("llm", llm.get("provider", ""), llm.get("api_key", ""))
+            if _is_marked_validated(key):
+                self.set_status(_PREVIOUSLY_VALIDATED)
+                self._next_button.disabled = False
 
     @on(RadioSet.Changed, "#provider-set")
     def on_provider_changed(self, event: RadioSet.Changed) -> None:
         """Update help text when provider changes."""
-        help_widget = self.query_one("#api-key-help", Static)
+        help_widget = self._api_key_help
         if event.pressed.id == "anthropic":
             help_widget.update(
                 "[dim]To get your Anthropic API key:\n"
@@ -360,11 +501,9 @@ class LLMScreen(Screen):
     @on(Button.Pressed, "#validate")
     def validate_api_key(self) -> None:
         """Validate LLM API key."""
-        provider_set = self.query_one("#provider-set", RadioSet)
-        api_key_input = self.query_one("#api-key", Input)
-
-        api_key = api_key_input.value.strip()
-        provider = "anthropic" if provider_set.pressed_button.id == "anthropic" else "openai"
+        api_key = self._api_key_input.value.strip()
+        pressed = self._provider_set.pressed_button
+        provider = "anthropic" if pressed.id == "anthropic" else "openai"
 
         if not api_key:
             self.show_status("Please enter an API key", "error")
@@ -375,29 +514,27 @@ class LLMScreen(Screen):
     @work(exclusive=True)
     async def test_llm_key(self, provider: str, api_key: str) -> None:
         """Test LLM API key in background worker."""
-        status = self.query_one("#status", Static)
-        next_button = self.query_one("#next", Button)
+        next_button = self._next_button
 
-        status.update("[yellow]Validating API key...[/yellow]")
+        self.set_status(_LLM_VALIDATING)
         next_button.disabled = True
 
+        # Module names match provider names; the SDK import alone takes a moment,
+        # so it runs in a thread to keep the UI responsive
         try:
-            if provider == "anthropic":
-                client = anthropic.Anthropic(api_key=api_key)
-                # Test with a minimal request
-                client.messages.create(
-                    model="claude-3-5-haiku-20241022",
-                    max_tokens=10,
-                    messages=[{"role": "user", "content": "Hi"}]
-                )
-            else:
-                client = openai.OpenAI(api_key=api_key)
-                # Test with a minimal request
-                client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    max_tokens=10,
-                    messages=[{"role": "user", "content": "Hi"}]
-                )
+            sdk = await asyncio.to_thread(importlib.import_module, provider)
+        except ImportError as e:
+            self.set_status(
+                _LLM_FAIL_PREFIX + Text(f"The {provider} package isn't installed ({e}).")
+            )
+            return
+
+        cache_key = _credentials_key("llm", provider, api_key)
+        try:
+            if _get_cached_validation(cache_key) is None:
+                await _check_llm_key(provider, api_key)
+                _cache_validation(cache_key, True)
+                await asyncio.to_thread(_mark_validated, cache_key)
 
             app = self.app
             if isinstance(app, SetupApp):
@@ -406,33 +543,37 @@ class LLMScreen(Screen):
                     "api_key": api_key
                 }
 
-            status.update(f"[green]✓ API key validated successfully![/green]\n{provider.capitalize()} is ready.")
+            self.set_status(_LLM_SUCCESS_PREFIX + Text(f"{provider.capitalize()} is ready."))
             next_button.disabled = False
 
+        except sdk.AuthenticationError:
+            _validation_cache.pop(cache_key, None)
+            self.set_status(
+                _LLM_FAIL_PREFIX + Text(f"{provider.capitalize()} rejected this API key.")
+            )
+            next_button.disabled = True
         except Exception as e:
-            status.update(f"[red]✗ Validation failed:[/red]\n{str(e)}")
+            _validation_cache.pop(cache_key, None)
+            self.set_status(_LLM_FAIL_PREFIX + Text(str(e)))
             next_button.disabled = True
 
-    def show_status(self, message: str, status_type: str) -> None:
-        """Update status message."""
-        status = self.query_one("#status", Static)
-        if status_type == "error":
-            status.update(f"[red]{message}[/red]")
-        else:
-            status.update(f"[yellow]{message}[/yellow]")
-
     @on(Button.Pressed, "#next")
     def go_to_hosting(self) -> None:
         """Navigate to hosting configuration screen."""
-        self.app.push_screen(HostingScreen())
+        self.app.push_screen("hosting")
 
 
 class HostingScreen(Screen):
     """Hosting provider configuration screen."""
 
     _current_provider: str = "cloudflare"
+    _pending_provider: Optional[str] = None
+    _fields_timer: Optional[Timer] = None
 
-    CSS = """
+    # Seconds the provider selection must settle before its fields are swapped in
+    FIELD_UPDATE_DELAY = 0.15
+
+    DEFAULT_CSS = """
     HostingScreen {
         align: center middle;
     }
@@ -445,18 +586,6 @@ class HostingScreen(Screen):
         padding: 2 4;
     }
 
-    .screen-title {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-        padding-bottom: 1;
-    }
-
-    .field-label {
-        margin-top: 1;
-        margin-bottom: 0;
-    }
-
     #provider-set {
         margin: 1 0;
     }
@@ -464,26 +593,31 @@ class HostingScreen(Screen):
     #dynamic-fields {
         margin: 1 0;
         min-height: 10;
-    }
-
-    .input-field {
-        width: 100%;
-        margin-bottom: 1;
-    }
-
-    .button-row {
-        margin-top: 2;
-        width: 100%;
         height: auto;
     }
 
-    .button-row Button {
-        margin: 0 1;
+    #dynamic-fields > Vertical {
+        height: auto;
     }
     """
 
     def compose(self) -> ComposeResult:
         """Create hosting configuration layout."""
+        # Widgets read or updated by handlers, kept so they aren't looked up each time
+        self._provider_set = RadioSet(
+            RadioButton("Cloudflare Pages", id="cloudflare", value=True),
+            RadioButton("Vercel", id="vercel"),
+            RadioButton("Netlify", id="netlify"),
+            RadioButton("GitHub Pages", id="github"),
+            id="provider-set",
+        )
+        self._dynamic_fields = Container(id="dynamic-fields")
+        # One field group per provider, built on first selection and then only hidden
+        self._field_groups: dict[str, Vertical] = {}
+        self._provider_fields: dict[str, dict[str, Input]] = {}
+        # Inputs of the shown provider keyed by widget id, switched by update_fields
+        self._fields: dict[str, Input] = {}
+
         yield Header()
         yield Container(
             Static("Step 3/4: Hosting Configuration", classes="screen-title"),
@@ -493,14 +627,8 @@ class HostingScreen(Screen):
                 classes="help-text",
             ),
             Label("Choose Hosting Provider", classes="field-label"),
-            RadioSet(
-                RadioButton("Cloudflare Pages", id="cloudflare", value=True),
-                RadioButton("Vercel", id="vercel"),
-                RadioButton("Netlify", id="netlify"),
-                RadioButton("GitHub Pages", id="github"),
-                id="provider-set",
-            ),
-            Container(id="dynamic-fields"),
+            self._provider_set,
+            self._dynamic_fields,
             Horizontal(
                 Button("Back", variant="default", id="back"),
                 Button("Next", variant="success", id="next"),
@@ -525,8 +653,7 @@ class HostingScreen(Screen):
 
         # Select the correct provider radio button (after fields exist)
         if provider != "cloudflare":
-            provider_set = self.query_one("#provider-set", RadioSet)
-            for button in provider_set.query(RadioButton):
+            for button in self._provider_set.query(RadioButton):
                 if button.id == provider:
                     button.value = True
                     break
@@ -545,41 +672,77 @@ class HostingScreen(Screen):
 
         if provider == "cloudflare":
             if "account_id" in provider_config:
-                self.query_one("#account-id", Input).value = provider_config["account_id"]
+                self._fields["account-id"].value = provider_config["account_id"]
             if "project_name" in provider_config:
-                self.query_one("#project-name", Input).value = provider_config["project_name"]
+                self._fields["project-name"].value = provider_config["project_name"]
             if "api_token" in provider_config:
-                self.query_one("#api-token", Input).value = provider_config["api_token"]
+                self._fields["api-token"].value = provider_config["api_token"]
         elif provider == "vercel":
             if "token" in provider_config:
-                self.query_one("#token", Input).value = provider_config["token"]
+                self._fields["token"].value = provider_config["token"]
             if "project_name" in provider_config:
-                self.query_one("#project-name", Input).value = provider_config["project_name"]
+                self._fields["project-name"].value = provider_config["project_name"]
         elif provider == "netlify":
             if "auth_token" in provider_config:
-                self.query_one("#token", Input).value = provider_config["auth_token"]
+                self._fields["token"].value = provider_config["auth_token"]
             if "site_id" in provider_config:
-                self.query_one("#site-id", Input).value = provider_config["site_id"]
+                self._fields["site-id"].value = provider_config["site_id"]
         elif provider == "github":
             if "repo" in provider_config:
-                self.query_one("#repo", Input).value = provider_config["repo"]
+                self._fields["repo"].value = provider_config["repo"]
             if "branch" in provider_config:
-                self.query_one("#branch", Input).value = provider_config["branch"]
+                self._fields["branch"].value = provider_config["branch"]
+
+    def _field(self, **kwargs: Any) -> Input:
+        """Create a provider input and remember it by id."""
+        field = Input(**kwargs)
+        self._fields[kwargs["id"]] = field
+        return field
 
     @on(RadioSet.Changed, "#provider-set")
     def on_provider_changed(self, event: RadioSet.Changed) -> None:
-        """Update fields when provider changes."""
-        if event.pressed.id and event.pressed.id != self._current_provider:
-            self._current_provider = event.pressed.id
-            self.update_fields(event.pressed.id)
+        """Update fields once the provider selection settles."""
+        if not event.pressed.id:
+            return
+        # Each change restarts the timer, so stepping through providers only
+        # rebuilds the fields for the one that ends up selected
+        self._pending_provider = event.pressed.id
+        if self._fields_timer is not None:
+            self._fields_timer.stop()
+        self._fields_timer = self.set_timer(
+            self.FIELD_UPDATE_DELAY, self._apply_pending_provider
+        )
+
+    def _apply_pending_provider(self) -> None:
+        """Show the fields for the most recently selected provider."""
+        if self._fields_timer is not None:
+            self._fields_timer.stop()
+            self._fields_timer = None
+        provider, self._pending_provider = self._pending_provider, None
+        if provider and provider != self._current_provider:
+            self._current_provider = provider
+            self.update_fields(provider)
 
     def update_fields(self, provider: str) -> None:
-        """Update dynamic fields based on selected provider."""
-        container = self.query_one("#dynamic-fields", Container)
-        container.remove_children()
+        """Show the fields for a provider, building them the first time it's selected.
 
+        Other providers' groups are hidden rather than removed, so switching is a
+        visibility flip and anything typed into them survives switching back.
+        """
+        if provider not in self._field_groups:
+            self._provider_fields[provider] = self._fields = {}
+            group = self._build_field_group(provider)
+            self._field_groups[provider] = group
+            self._dynamic_fields.mount(group)
+
+        self._fields = self._provider_fields[provider]
+        for name, group in self._field_groups.items():
+            group.display = name == provider
+
+    def _build_field_group(self, provider: str) -> Vertical:
+        """Create the help text, labels, and inputs for a provider as one group."""
         if provider == "cloudflare":
-            container.mount(
+            return Vertical(
                 Static(
                     "[dim]Find your Account ID at:\n"
                     "dash.cloudflare.com → Right sidebar → Account ID\n\n"
@@ -589,26 +752,33 @@ class HostingScreen(Screen):
                     classes="help-text",
                 ),
                 Label("Account ID", classes="field-label"),
-                Input(placeholder="Your Cloudflare account ID", id="account-id", classes="input-field"),
+                self._field(
+                    placeholder="Your Cloudflare account ID", id="account-id", classes="input-field"
+                ),
                 Label("Project Name", classes="field-label"),
-                Input(placeholder="Your project name", id="project-name", classes="input-field"),
+                self._field(placeholder="Your project name", id="project-name", classes="input-field"),
                 Label("API Token", classes="field-label"),
-                Input(placeholder="Your Cloudflare API token", password=True, id="api-token", classes="input-field"),
+                self._field(
+                    placeholder="Your Cloudflare API token",
+                    password=True,
+                    id="api-token",
+                    classes="input-field",
+                ),
             )
-        elif provider == "vercel":
-            container.mount(
+        if provider == "vercel":
+            return Vertical(
                 Static(
                     "[dim]Create a token at:\n"
                     "vercel.com/account/tokens → Create Token[/]",
                     classes="help-text",
                 ),
                 Label("Token", classes="field-label"),
-                Input(placeholder="Your Vercel token", password=True, id="token", classes="input-field"),
+                self._field(placeholder="Your Vercel token", password=True, id="token", classes="input-field"),
                 Label("Project Name", classes="field-label"),
-                Input(placeholder="Your project name", id="project-name", classes="input-field"),
+                self._field(placeholder="Your project name", id="project-name", classes="input-field"),
             )
-        elif provider == "netlify":
-            container.mount(
+        if provider == "netlify":
+            return Vertical(
                 Static(
                     "[dim]Get credentials at:\n"
                     "• Token: app.netlify.com/user/applications (Personal access tokens)\n"
@@ -616,23 +786,23 @@ class HostingScreen(Screen):
                     classes="help-text",
                 ),
                 Label("Token", classes="field-label"),
-                Input(placeholder="Your Netlify token", password=True, id="token", classes="input-field"),
+                self._field(placeholder="Your Netlify token", password=True, id="token", classes="input-field"),
                 Label("Site ID", classes="field-label"),
-                Input(placeholder="Your site ID", id="site-id", classes="input-field"),
-            )
-        elif provider == "github":
-            container.mount(
-                Static(
-                    "[dim]GitHub Pages deploys from a repository branch.\n"
-                    "Enter your repo in 'username/repo' format.\n"
-                    "The gh-pages branch is commonly used for static sites.[/]",
-                    classes="help-text",
-                ),
-                Label("Repository", classes="field-label"),
-                Input(placeholder="username/repo", id="repo", classes="input-field"),
-                Label("Branch", classes="field-label"),
-                Input(placeholder="gh-pages", value="gh-pages", id="branch", classes="input-field"),
+                self._field(placeholder="Your site ID", id="site-id", classes="input-field"),
             )
+        # github
+        return Vertical(
+            Static(
+                "[dim]GitHub Pages deploys from a repository branch.\n"
+                "Enter your repo in 'username/repo' format.\n"
+                "The gh-pages branch is commonly used for static sites.[/]",
+                classes="help-text",
+            ),
+            Label("Repository", classes="field-label"),
+            self._field(placeholder="username/repo", id="repo", classes="input-field"),
+            Label("Branch", classes="field-label"),
+            self._field(placeholder="gh-pages", value="gh-pages", id="branch", classes="input-field"),
+        )
 
     @on(Button.Pressed, "#back")
     def go_back(self) -> None:
@@ -642,38 +812,41 @@ class HostingScreen(Screen):
     @on(Button.Pressed, "#next")
     def go_to_summary(self) -> None:
         """Navigate to summary screen."""
-        provider_set = self.query_one("#provider-set", RadioSet)
-        provider = provider_set.pressed_button.id if provider_set.pressed_button else "cloudflare"
+        # Don't read fields from a provider the user already switched away from
+        self._apply_pending_provider()
+
+        pressed = self._provider_set.pressed_button
+        provider = pressed.id if pressed else "cloudflare"
 
         # Collect provider-specific config
         config: Dict[str, Any] = {}
 
         if provider == "cloudflare":
-            account_id = self.query_one("#account-id", Input).value.strip()
-            project_name = self.query_one("#project-name", Input).value.strip()
-            api_token = self.query_one("#api-token", Input).value.strip()
+            account_id = self._fields["account-id"].value.strip()
+            project_name = self._fields["project-name"].value.strip()
+            api_token = self._fields["api-token"].value.strip()
             config = {
                 "account_id": account_id,
                 "project_name": project_name,
                 "api_token": api_token,
             }
         elif provider == "vercel":
-            token = self.query_one("#token", Input).value.strip()
-            project_name = self.query_one("#project-name", Input).value.strip()
+            token = self._fields["token"].value.strip()
+            project_name = self._fields["project-name"].value.strip()
             config = {
                 "token": token,
                 "project_name": project_name,
             }
         elif provider == "netlify":
-            token = self.query_one("#token", Input).value.strip()
-            site_id = self.query_one("#site-id", Input).value.strip()
+            token = self._fields["token"].value.strip()
+            site_id = self._fields["site-id"].value.strip()
             config = {
                 "auth_token": token,
                 "site_id": site_id,
             }
         elif provider == "github":
-            repo = self.query_one("#repo", Input).value.strip()
-            branch = self.query_one("#branch", Input).value.strip() or "gh-pages"
+            repo = self._fields["repo"].value.strip()
+            branch = self._fields["branch"].value.strip() or "gh-pages"
             config = {
                 "repo": repo,
                 "branch": branch,
@@ -686,13 +859,13 @@ class HostingScreen(Screen):
                 provider: config
             }
 
-        self.app.push_screen(SummaryScreen())
+        self.app.push_screen("summary")
 
 
-class SummaryScreen(Screen):
+class SummaryScreen(StatusScreen):
     """Configuration summary and save screen."""
 
-    CSS = """
+    DEFAULT_CSS = """
     SummaryScreen {
         align: center middle;
     }
@@ -705,13 +878,6 @@ class SummaryScreen(Screen):
         padding: 2 4;
     }
 
-    .screen-title {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-        padding-bottom: 1;
-    }
-
     #config-summary {
         margin: 1 0;
         padding: 1;
@@ -719,93 +885,117 @@ class SummaryScreen(Screen):
         border: solid $primary;
         min-height: 15;
     }
-
-    .field-label {
-        margin-top: 1;
-        margin-bottom: 0;
-    }
-
-    .input-field {
-        width: 100%;
-        margin-bottom: 1;
-    }
-
-    #status {
-        margin-top: 1;
-        min-height: 3;
-    }
-
-    .button-row {
-        margin-top: 2;
-        width: 100%;
-        height: auto;
-    }
-
-    .button-row Button {
-        margin: 0 1;
-    }
     """
 
     def compose(self) -> ComposeResult:
         """Create summary screen layout."""
+        # Widgets read or updated by handlers, kept so they aren't looked up each time
+        current_year = datetime.now().year
+        self._year_input = Input(
+            value=str(current_year),
+            id="year",
+            validators=[Integer(minimum=1970, maximum=current_year + 1)],
+            classes="input-field",
+        )
+        self._output_dir_input = Input(value="dist", id="output-dir", classes="input-field")
+        self._summary_widget = Static(id="config-summary")
+        self._status_widget = Static("", id="status")
+        self._save_button = Button("Save Config", variant="primary", id="save")
+        self._generate_button = Button("Generate", variant="success", id="generate", disabled=True)
+
         yield Header()
         yield Container(
             Static("Step 4/4: Review and Save", classes="screen-title"),
-            Static(self.build_summary(), id="config-summary"),
+            self._summary_widget,
             Label("Year", classes="field-label"),
-            Input(value=str(datetime.now().year), id="year", classes="input-field"),
+            self._year_input,
             Label("Output Directory", classes="field-label"),
-            Input(value="dist", id="output-dir", classes="input-field"),
-            Static("", id="status"),
+            self._output_dir_input,
+            self._status_widget,
             Horizontal(
                 Button("Back", variant="default", id="back"),
-                Button("Save Config", variant="primary", id="save"),
-                Button("Generate", variant="success", id="generate", disabled=True),
+                self._save_button,
+                self._generate_button,
                 classes="button-row",
             ),
             id="summary-container",
         )
         yield Footer()
 
-    def build_summary(self) -> str:
-        """Build configuration summary text."""
+    def build_summary(self) -> Table:
+        """Build the configuration summary as a two-column table."""
+        # Cells are Text rather than markup strings, so Rich never parses config values
+        table = Table(
+            title="Configuration Summary",
+            title_style="bold",
+            title_justify="left",
+            show_header=False,
+            box=None,
+            padding=(0, 1, 0, 0),
+        )
+        table.add_column(style="cyan", no_wrap=True)
+        table.add_column()
+
         app = self.app
         if not isinstance(app, SetupApp):
-            return "No configuration data available"
+            table.add_row(Text("No configuration data available"))
+            return table
 
         config = app.config_data
-        lines = ["[bold]Configuration Summary[/bold]\n"]
+        # Back-then-forward revisits usually find the config unchanged
+        cache_key = repr(config)
+        if app._summary_cache is not None and app._summary_cache[0] == cache_key:
+            return app._summary_cache[1]
 
         # Plex
         if "plex" in config:
             plex = config["plex"]
-            lines.append(f"[cyan]Plex Server:[/cyan] {plex.get('url', 'Not set')}")
-            lines.append(f"[cyan]Token:[/cyan] {'*' * 8}...{plex.get('token', '')[-4:]}\n")
+            table.add_row(Text("Plex Server:"), Text(plex.get("url", "Not set")))
+            table.add_row(Text("Token:"), Text(_mask_secret(plex.get("token", ""))))
+            table.add_row()
 
         # LLM
         if "llm" in config:
             llm = config["llm"]
-            provider = llm.get('provider', 'Not set')
-            lines.append(f"[cyan]LLM Provider:[/cyan] {provider.capitalize()}")
-            api_key = llm.get('api_key', '')
+            provider = llm.get("provider", "Not set")
+            table.add_row(Text("LLM Provider:"), Text(provider.capitalize()))
+            api_key = llm.get("api_key", "")
             if api_key:
-                lines.append(f"[cyan]API Key:[/cyan] {'*' * 8}...{api_key[-4:]}\n")
+                table.add_row(Text("API Key:"), Text(_mask_secret(api_key)))
+            table.add_row()
 
         # Hosting
         if "hosting" in config:
             hosting = config["hosting"]
-            provider = hosting.get('provider', 'Not set')
-            lines.append(f"[cyan]Hosting:[/cyan] {provider.capitalize()}")
+            provider = hosting.get("provider", "Not set")
+            table.add_row(Text("Hosting:"), Text(provider.capitalize()))
 
             provider_config = hosting.get(provider, {})
             for key, value in provider_config.items():
                 if "token" in key.lower() or "key" in key.lower():
-                    display_value = f"{'*' * 8}...{value[-4:]}" if value else "Not set"
+                    display_value = _mask_secret(value) if value else "Not set"
                 else:
                     display_value = value or "Not set"
-                lines.append(f"  {key}: {display_value}")
-
-        return "\n".join(lines)
+                table.add_row(Text(f"  {key}:", style="default"), Text(str(display_value)))
+
+        app._summary_cache = (cache_key, table)
+        return table
+
+    def on_screen_resume(self) -> None:
+        """Refresh the summary each time the screen is shown, since it's reused across visits."""
+        self._summary_widget.update(self.build_summary())
+        # Config may have changed since the last save
+        self._save_button.disabled = not self._year_input.is_valid
+
+    @on(Input.Changed, "#year")
+    def validate_year(self, event: Input.Changed) -> None:
+        """Only allow saving while the year is a plausible integer."""
+        valid = event.validation_result is None or event.validation_result.is_valid
+        self._save_button.disabled = not valid
+        if not valid:
+            self.set_status(_INVALID_YEAR)
+        elif self._last_status == _INVALID_YEAR:
+            self.set_status("")
 
     @on(Button.Pressed, "#back")
     def go_back(self) -> None:
@@ -813,22 +1003,16 @@ class SummaryScreen(Screen):
         self.app.pop_screen()
 
     @on(Button.Pressed, "#save")
-    def save_config(self) -> None:
+    async def save_config(self) -> None:
         """Save configuration to file."""
         app = self.app
         if not isinstance(app, SetupApp):
             return
 
-        year_input = self.query_one("#year", Input)
-        output_dir_input = self.query_one("#output-dir", Input)
-
-        try:
-            year = int(year_input.value.strip())
-        except ValueError:
-            self.show_status("Invalid year value", "error")
-            return
+        # The year input's validator keeps Save disabled until this parses
+        year = int(self._year_input.value)
 
-        output_dir = output_dir_input.value.strip() or "dist"
+        output_dir = self._output_dir_input.value.strip() or "dist"
 
         # Add year and output_dir to config
         app.config_data["year"] = year
@@ -838,11 +1022,9 @@ class SummaryScreen(Screen):
         config_path = Path("config.yaml")
 
         try:
-            with open(config_path, "w") as f:
-                yaml.dump(app.config_data, f, default_flow_style=False, sort_keys=False)
+            await asyncio.to_thread(app.config_writer, config_path, app.config_data)
 
-            status = self.query_one("#status", Static)
-            status.update(
+            self.set_status(
                 f"[green]✓ Configuration saved to {config_path}![/green]\n\n"
                 "Click 'Generate' to run the full pipeline,\n"
                 "or use CLI commands:\n"
@@ -850,23 +1032,12 @@ class SummaryScreen(Screen):
             )
 
             # Disable save button and enable generate button after successful save
-            save_button = self.query_one("#save", Button)
-            save_button.disabled = True
-
-            generate_button = self.query_one("#generate", Button)
-            generate_button.disabled = False
+            self._save_button.disabled = True
+            self._generate_button.disabled = False
 
         except Exception as e:
             self.show_status(f"Failed to save config: {str(e)}", "error")
 
-    def show_status(self, message: str, status_type: str) -> None:
-        """Update status message."""
-        status = self.query_one("#status", Static)
-        if status_type == "error":
-            status.update(f"[red]{message}[/red]")
-        else:
-            status.update(f"[green]{message}[/green]")
-
     @on(Button.Pressed, "#generate")
     def go_to_processing(self) -> None:
         """Navigate to processing screen to run the pipeline."""
@@ -876,7 +1047,7 @@ class SummaryScreen(Screen):
 class ProcessingScreen(Screen):
     """Processing screen that runs extract, process, and build stages."""
 
-    CSS = """
+    DEFAULT_CSS = """
     ProcessingScreen {
         align: center middle;
     }
@@ -889,13 +1060,6 @@ class ProcessingScreen(Screen):
         padding: 2 4;
     }
 
-    .screen-title {
-        text-align: center;
-        text-style: bold;
-        color: $accent;
-        padding-bottom: 1;
-    }
-
     .stage-row {
         margin: 1 0;
         height: 3;
@@ -917,16 +1081,6 @@ class ProcessingScreen(Screen):
         height: 15;
         overflow-y: auto;
     }
-
-    .button-row {
-        margin-top: 2;
-        width: 100%;
-        height: auto;
-    }
-
-    .button-row Button {
-        margin: 0 1;
-    }
     """
 
     def compose(self) -> ComposeResult:
@@ -972,7 +1126,14 @@ class ProcessingScreen(Screen):
     @on(Button.Pressed, "#edit-config")
     def go_to_setup(self) -> None:
         """Navigate to setup wizard to edit config."""
-        self.app.push_screen(PlexScreen())
+        app = self.app
+        plex_screen = app.get_screen("plex")
+        if plex_screen in app.screen_stack:
+            # Reached from the wizard, so step back into it instead of stacking it twice
+            while app.screen is not plex_screen:
+                app.pop_screen()
+        else:
+            app.push_screen(plex_screen)
 
     @on(Button.Pressed, "#start-generation")
     def start_generation(self) -> None:
@@ -1037,7 +1198,7 @@ class ProcessingScreen(Screen):
             self._thread_log("[yellow]Building frontend...[/yellow]")
             self._thread_log(f"  Building in {app.project_root / 'frontend'}")
             start_time = time.time()
-            orchestrator.build()
+            orchestrator.build(on_progress=self._thread_log)
             elapsed = time.time() - start_time
             self._thread_log(f"[green]✓ Build complete ({elapsed:.1f}s)[/green]")
             self.app.call_from_thread(self._update_ui_stage, "build", "done", "")
@@ -1048,7 +1209,7 @@ class ProcessingScreen(Screen):
                 self.app.call_from_thread(self._update_ui_stage, "deploy", "running", "")
                 self._thread_log(f"[yellow]Deploying to {provider}...[/yellow]")
                 start_time = time.time()
-                orchestrator.deploy()
+                orchestrator.deploy(on_progress=self._thread_log)
                 elapsed = time.time() - start_time
                 self._thread_log(f"[green]✓ Deployment complete ({elapsed:.1f}s)[/green]")
                 self.app.call_from_thread(self._update_ui_stage, "deploy", "done", "")
@@ -1132,23 +1293,70 @@ class SetupApp(App):
         padding: 0 1;
         color: $text-muted;
     }
+
+    .screen-title {
+        text-align: center;
+        text-style: bold;
+        color: $accent;
+        padding-bottom: 1;
+    }
+
+    .field-label {
+        margin-top: 1;
+        margin-bottom: 0;
+    }
+
+    .input-field {
+        width: 100%;
+        margin-bottom: 1;
+    }
+
+    #status {
+        margin-top: 1;
+        min-height: 3;
+    }
+
+    .button-row {
+        margin-top: 2;
+        width: 100%;
+        height: auto;
+    }
+
+    .button-row Button {
+        margin: 0 1;
+    }
     """
 
+    # Wizard steps are installed so Back/Next reuse one instance of each
+    SCREENS = {
+        "plex": PlexScreen,
+        "llm": LLMScreen,
+        "hosting": HostingScreen,
+        "summary": SummaryScreen,
+    }
+
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("escape", "quit", "Quit"),
     ]
 
-    def __init__(self, project_root: Optional[Path] = None) -> None:
+    def __init__(
+        self, project_root: Optional[Path] = None, config_writer: ConfigWriter = _write_config
+    ) -> None:
         """Initialize setup app.
 
         Args:
             project_root: Root directory of the project containing frontend/.
                           Defaults to auto-detected from current working directory.
+            config_writer: Saves the finished config (blocking; run in a worker thread).
+                           Defaults to writing YAML to the given path.
         """
         super().__init__()
         self.project_root = project_root or self._detect_project_root()
+        self.config_writer = config_writer
         self.config_data: Dict[str, Any] = {}
+        # (repr of config_data, rendered summary) from the last SummaryScreen visit
+        self._summary_cache: Optional[tuple[str, Table]] = None
         self._load_existing_config()
 
     def _detect_project_root(self) -> Path:
@@ -1170,9 +1378,12 @@ class SetupApp(App):
         """Load existing config.yaml if present."""
         config_path = Path("config.yaml")
         if config_path.exists():
+            import yaml
+
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             try:
                 with open(config_path) as f:
-                    self.config_data = yaml.safe_load(f) or {}
+                    self.config_data = yaml.load(f, Loader=loader) or {}
             except Exception:
                 self.config_data = {}
 
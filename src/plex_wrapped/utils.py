@@ -2,13 +2,23 @@
 # ABOUTME: Includes text processing and common helpers.
 
 import re
+from functools import lru_cache
 
+_NON_WORD_RE = re.compile(r'[^\w\s-]')
+_DASH_SPACE_RE = re.compile(r'[-\s]+')
 
+
+# slugify is pure (the slug depends only on the immutable input string), so caching
+# is safe. Each user needs at most ~100 distinct names (top 10 artists, albums and
+# tracks, plus their artists and albums), so 4096 entries cover dozens of users
+# while capping memory at a few hundred KB of short strings.
+@lru_cache(maxsize=4096)
 def slugify(text: str) -> str:
     """Convert text to a safe filename slug.
 
     Removes special characters, converts to lowercase, replaces spaces with hyphens,
-    and limits the result to 50 characters.
+    and limits the result to 50 characters. Results are cached, since the same
+    artist and album names are slugified many times per run.
 
     Args:
         text: Input text to slugify
@@ -26,8 +36,8 @@ def slugify(text: str) -> str:
         return ""
 
     # Remove special characters, keep alphanumeric and spaces
-    text = re.sub(r'[^\w\s-]', '', text.lower())
+    text = _NON_WORD_RE.sub('', text.lower())
     # Replace spaces and multiple hyphens with single hyphen
-    text = re.sub(r'[-\s]+', '-', text).strip('-')
+    text = _DASH_SPACE_RE.sub('-', text).strip('-')
     # Limit length
     return text[:50]
@@ -0,0 +1,32 @@
+# ABOUTME: Shared pytest fixtures for the plex-wrapped test suite.
+# ABOUTME: Provides a SetupApp started once per module for the TUI tests.
+
+import pytest_asyncio
+
+from plex_wrapped.setup_tui import SetupApp
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def running_app():
+    """A SetupApp and its pilot, started once per test module."""
+    app = SetupApp()
+    async with app.run_test(headless=True, size=(80, 24)) as pilot:
+        yield app, pilot
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def setup_app(running_app):
+    """The shared SetupApp with empty config, returned to its start screen after the test."""
+    app, pilot = running_app
+    base_depth = len(app.screen_stack)
+    app.config_data = {}
+    app._summary_cache = None
+    yield app, pilot
+    while len(app.screen_stack) > base_depth:
+        app.pop_screen()
+    await pilot.pause()
+    # Named wizard screens are kept alive once pushed; reinstall them so the next
+    # test mounts fresh instances
+    for name, screen in SetupApp.SCREENS.items():
+        app.uninstall_screen(name)
+        app.install_screen(screen, name)
@@ -5,6 +5,7 @@ import pytest
 
 from plex_wrapped.ai.generators import (
     AuraGenerator,
+    CompositeGenerator,
     HotTakesGenerator,
     NarrativeGenerator,
     PersonalityGenerator,
@@ -22,14 +23,22 @@ class MockProvider(LLMProvider):
     def __init__(self, response: str = "mock response") -> None:
         self.response = response
         self.last_prompt: str | None = None
-
-    def generate(self, prompt: str, max_tokens: int = 1024) -> str:
+        self.last_system: str | None = None
+
+    async def generate(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
         self.last_prompt = prompt
+        self.last_system = system
         return self.response
 
 
 class TestNarrativeGenerator:
-    def test_generates_narrative_from_stats(self) -> None:
+    async def test_generates_narrative_from_stats(self) -> None:
         """Narrative generator creates story from user stats."""
         provider = MockProvider('{"narrative": "Your 2024 was wild..."}')
         generator = NarrativeGenerator(provider)
@@ -39,24 +48,24 @@ class TestNarrativeGenerator:
             "top_artist": "Radiohead",
             "top_genre": "Alternative",
         }
-        result = generator.generate(stats)
+        result = await generator.generate(stats)
 
         assert provider.last_prompt is not None
         assert "42000" in provider.last_prompt
         assert "Radiohead" in provider.last_prompt
 
-    def test_prompt_includes_instruction_for_humor(self) -> None:
+    async def test_prompt_includes_instruction_for_humor(self) -> None:
         """Prompt asks for playful, humorous tone."""
         provider = MockProvider('{"narrative": "test"}')
         generator = NarrativeGenerator(provider)
 
-        generator.generate({"total_minutes": 100})
+        await generator.generate({"total_minutes": 100})
 
-        assert "playful" in provider.last_prompt.lower() or "humor" in provider.last_prompt.lower()
+        assert "playful" in provider.last_system.lower() or "humor" in provider.last_system.lower()
 
 
 class TestPersonalityGenerator:
-    def test_generates_personality_type(self) -> None:
+    async def test_generates_personality_type(self) -> None:
         """Personality generator creates type with tagline."""
         response = '''{
             "type": "The Chaos Agent",
@@ -67,19 +76,19 @@ class TestPersonalityGenerator:
         provider = MockProvider(response)
         generator = PersonalityGenerator(provider)
 
-        result = generator.generate({"genres": ["rock", "pop", "jazz"]})
+        result = await generator.generate({"genres": ["rock", "pop", "jazz"]})
 
         assert provider.last_prompt is not None
 
 
 class TestRoastGenerator:
-    def test_generates_roasts_from_stats(self) -> None:
+    async def test_generates_roasts_from_stats(self) -> None:
         """Roast generator creates playful callouts."""
         response = '{"roasts": ["Your 2am listening habits are concerning"]}'
         provider = MockProvider(response)
         generator = RoastGenerator(provider)
 
-        result = generator.generate({
+        result = await generator.generate({
             "late_night_plays": 200,
             "most_repeated_track": "same song",
         })
@@ -88,7 +97,7 @@ class TestRoastGenerator:
 
 
 class TestSuperlativesGenerator:
-    def test_generates_superlatives_from_stats(self) -> None:
+    async def test_generates_superlatives_from_stats(self) -> None:
         """Superlatives generator creates awards from stats."""
         response = '''{
             "superlatives": [
@@ -98,27 +107,27 @@ class TestSuperlativesGenerator:
         provider = MockProvider(response)
         generator = SuperlativesGenerator(provider)
 
-        result = generator.generate({"top_track_plays": 200})
+        result = await generator.generate({"top_track_plays": 200})
 
         assert provider.last_prompt is not None
-        assert "superlatives" in provider.last_prompt.lower() or "award" in provider.last_prompt.lower()
+        assert "superlatives" in provider.last_system.lower() or "award" in provider.last_system.lower()
 
 
 class TestHotTakesGenerator:
-    def test_generates_hot_takes_from_stats(self) -> None:
+    async def test_generates_hot_takes_from_stats(self) -> None:
         """HotTakes generator creates spicy opinions."""
         response = '{"hot_takes": ["You say you like indie, but your top 10 is basically the radio"]}'
         provider = MockProvider(response)
         generator = HotTakesGenerator(provider)
 
-        result = generator.generate({"top_artists": ["Pop Artist 1", "Pop Artist 2"]})
+        result = await generator.generate({"top_artists": ["Pop Artist 1", "Pop Artist 2"]})
 
         assert provider.last_prompt is not None
-        assert "hot take" in provider.last_prompt.lower()
+        assert "hot take" in provider.last_system.lower()
 
 
 class TestThemeGenerator:
-    def test_generates_theme_with_palette_and_slides(self) -> None:
+    async def test_generates_theme_with_palette_and_slides(self) -> None:
         """Theme generator creates colors and per-slide visualizations."""
         response = '''{
             "palette": {
@@ -135,10 +144,166 @@ class TestThemeGenerator:
         provider = MockProvider(response)
         generator = ThemeGenerator(provider)
 
-        result = generator.generate({"top_genres": ["rock", "electronic"]})
+        result = await generator.generate({"top_genres": ["rock", "electronic"]})
 
         assert provider.last_prompt is not None
-        assert "palette" in provider.last_prompt.lower()
-        assert "visualization" in provider.last_prompt.lower()
+        assert "palette" in provider.last_system.lower()
+        assert "visualization" in provider.last_system.lower()
         assert result["palette"]["primary"] == "#6366F1"
         assert "intro" in result["slides"]
+
+
+class TestCompositeGenerator:
+    async def test_generates_all_sections_in_one_call(self) -> None:
+        """Composite generator returns every section and fills gaps with defaults."""
+        response = '''{
+            "narrative": {"narrative": "What a year"},
+            "roast": {"roasts": ["Too much Radiohead"]}
+        }'''
+        provider = MockProvider(response)
+        generator = CompositeGenerator(provider)
+
+        result = await generator.generate({"top_artist": "Radiohead"})
+
+        assert set(result) == set(CompositeGenerator.SECTIONS)
+        assert result["narrative"] == {"narrative": "What a year"}
+        assert result["roast"] == {"roasts": ["Too much Radiohead"]}
+        assert result["aura"] == AuraGenerator.DEFAULT
+        assert "hot_takes" in provider.last_system
+
+    async def test_non_object_reply_falls_back_per_section(self) -> None:
+        """A reply that parses to a list leaves every section on its default."""
+        provider = MockProvider('[{"narrative": "What a year"}]')
+        generator = CompositeGenerator(provider)
+
+        result = await generator.generate({"top_artist": "Radiohead"})
+
+        assert result == CompositeGenerator.DEFAULT
+
+    async def test_partial_reply_is_not_cached(self, tmp_path) -> None:
+        """A reply missing sections is used but not written to the response cache."""
+        from plex_wrapped.ai.cache import ResponseCache
+
+        provider = MockProvider('{"narrative": {"narrative": "What a year"}}')
+        result = await CompositeGenerator(provider, ResponseCache(tmp_path)).generate({})
+
+        assert result["narrative"] == {"narrative": "What a year"}
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestResponseParsing:
+    async def test_extracts_nested_object_from_prose(self) -> None:
+        """JSON wrapped in prose is recovered, including nested objects."""
+        response = 'Here you go!\n{"palette": {"primary": "#6366F1"}, "slides": {}}\nEnjoy.'
+        provider = MockProvider(response)
+        generator = ThemeGenerator(provider)
+
+        result = await generator.generate({"top_artists": []})
+
+        assert result["palette"] == {"primary": "#6366F1"}
+
+    async def test_recovers_raw_newlines_inside_strings(self) -> None:
+        """Unescaped line breaks inside string values don't make the response unparseable."""
+        response = '{"narrative": "Line one\nLine two \\"quoted\\"\r\nEnd"}'
+        provider = MockProvider(response)
+        generator = NarrativeGenerator(provider)
+
+        result = await generator.generate({"total_minutes": 100})
+
+        assert result["narrative"] == 'Line one\nLine two "quoted"\r\nEnd'
+
+    async def test_salvages_complete_members_of_truncated_response(self, tmp_path) -> None:
+        """A truncated response keeps the top-level members that arrived, uncached."""
+        from plex_wrapped.ai.cache import ResponseCache
+
+        response = (
+            '{"palette": {"primary": "#6366F1", "note": "a {brace}, here"}, '
+            '"slides": {"intro": {"mood": "dram'
+        )
+        provider = MockProvider(response)
+        generator = ThemeGenerator(provider, ResponseCache(tmp_path))
+
+        result = await generator.generate({"top_artists": []})
+
+        assert result == {"palette": {"primary": "#6366F1", "note": "a {brace}, here"}}
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_truncated_response_without_expected_keys_falls_back(self) -> None:
+        """An inner object is never mistaken for the whole truncated reply."""
+        response = '{"theme": {"primary": "#111", "secondary": "#222"}, "slides": {"intro'
+        provider = MockProvider(response)
+        generator = ThemeGenerator(provider)
+
+        result = await generator.generate({"top_artists": []})
+
+        assert result == ThemeGenerator.DEFAULT
+
+    async def test_truncated_composite_keeps_finished_sections(self) -> None:
+        """Sections that arrived before the cut survive; the rest use their defaults."""
+        response = (
+            '{"narrative": {"narrative": "What a year"}, '
+            '"personality": {"type": "The Expl'
+        )
+        provider = MockProvider(response)
+
+        result = await CompositeGenerator(provider).generate({})
+
+        assert result["narrative"] == {"narrative": "What a year"}
+        assert result["personality"] == CompositeGenerator.DEFAULT["personality"]
+
+
+class TestPromptCaching:
+    async def test_system_prompt_is_identical_across_users(self) -> None:
+        """Static instructions don't vary with stats so the provider can cache them."""
+        provider = MockProvider('{"narrative": "test"}')
+        generator = NarrativeGenerator(provider)
+
+        await generator.generate({"user": "alice", "total_minutes": 10})
+        first_system, first_prompt = provider.last_system, provider.last_prompt
+        await generator.generate({"user": "bob", "total_minutes": 20})
+
+        assert provider.last_system == first_system
+        assert provider.last_prompt != first_prompt
+        assert "bob" not in provider.last_system
+
+
+class TestStatsPayload:
+    async def test_prompt_only_includes_generator_fields(self) -> None:
+        """Generators send only the stats they need, compactly and without image URLs."""
+        provider = MockProvider('{"color": "Blue"}')
+        generator = AuraGenerator(provider)
+
+        await generator.generate({
+            "user": "alice",
+            "top_artists": [{"name": "Radiohead", "minutes": 12.3456, "image_url": "/images/x.jpg"}],
+            "time_analysis": {"plays_by_hour": [0] * 24},
+        })
+
+        assert '{"top_artists":[{"name":"Radiohead","minutes":12.3}]}' in provider.last_prompt
+        assert "plays_by_hour" not in provider.last_prompt
+
+
+class TestResponseCache:
+    async def test_cached_response_skips_provider(self, tmp_path) -> None:
+        """A second run with identical stats is served from the cache."""
+        from plex_wrapped.ai.cache import ResponseCache
+
+        cache = ResponseCache(tmp_path)
+        provider = MockProvider('{"roasts": ["cached roast"]}')
+        await RoastGenerator(provider, cache).generate({"total_minutes": 100})
+
+        provider.last_prompt = None
+        result = await RoastGenerator(provider, cache).generate({"total_minutes": 100})
+
+        assert provider.last_prompt is None
+        assert result == {"roasts": ["cached roast"]}
+
+    async def test_fallback_default_is_not_cached(self, tmp_path) -> None:
+        """Unparseable responses fall back to defaults without poisoning the cache."""
+        from plex_wrapped.ai.cache import ResponseCache
+
+        cache = ResponseCache(tmp_path)
+        provider = MockProvider("not json at all")
+        await RoastGenerator(provider, cache).generate({"total_minutes": 100})
+
+        assert list(tmp_path.iterdir()) == []
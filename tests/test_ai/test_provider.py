@@ -14,10 +14,16 @@ class TestProviderSelection:
         provider = get_provider(config)
         assert isinstance(provider, NoOpProvider)
 
-    def test_noop_provider_returns_empty_strings(self) -> None:
+    def test_provider_uses_configured_temperature(self) -> None:
+        """Temperature from config is passed through to the provider."""
+        config = LLMConfig(provider="anthropic", api_key="sk-test", temperature=0.7)
+        provider = get_provider(config)
+        assert provider.temperature == 0.7
+
+    async def test_noop_provider_returns_empty_strings(self) -> None:
         """NoOpProvider returns empty/default content."""
         provider = NoOpProvider()
-        result = provider.generate("test prompt")
+        result = await provider.generate("test prompt")
         assert result == ""
 
 
@@ -27,3 +33,29 @@ class TestLLMProviderInterface:
         provider = NoOpProvider()
         assert hasattr(provider, "generate")
         assert callable(provider.generate)
+
+
+class TestJsonObjectScanner:
+    def test_finds_object_end_across_chunks(self) -> None:
+        """The end of the first object is found even when it spans chunks."""
+        from plex_wrapped.ai.provider import _JsonObjectScanner
+
+        scanner = _JsonObjectScanner()
+        chunks = ['Sure! {"a": "br{ace', ' \\"q\\" }", "b": {"c": 1', "}}", " Hope that helps."]
+
+        assert [scanner.feed(chunk) for chunk in chunks[:2]] == [None, None]
+        assert scanner.feed(chunks[2]) == 2
+
+
+class TestCacheUsageLogging:
+    def test_logs_cache_read_and_write_tokens(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Prompt cache hits and writes from a response's usage are logged at debug level."""
+        from types import SimpleNamespace
+
+        from plex_wrapped.ai.provider import _log_cache_usage
+
+        usage = SimpleNamespace(cache_read_input_tokens=1200, cache_creation_input_tokens=0)
+        with caplog.at_level("DEBUG", logger="plex_wrapped.ai.provider"):
+            _log_cache_usage(usage)
+
+        assert "1200 input tokens read, 0 written" in caplog.text
@@ -0,0 +1,140 @@
+# ABOUTME: Tests for LLM request rate limiting.
+# ABOUTME: Verifies AIMD concurrency adjustment, window limits, and 429 retries.
+
+import asyncio
+
+import pytest
+
+from plex_wrapped.ai.provider import LLMProvider, RateLimitError
+from plex_wrapped.ai.rate_limiter import RateLimitedProvider, RateLimiter, RateLimits
+
+
+class FlakyProvider(LLMProvider):
+    """Provider that rate limits a fixed number of requests before succeeding."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RateLimitError("429 Too Many Requests")
+        return "ok"
+
+
+class StallingProvider(LLMProvider):
+    """Provider whose first requests hang until cancelled."""
+
+    def __init__(self, stalls: int) -> None:
+        self.stalls = stalls
+        self.calls = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        system: str | None = None,
+        max_tokens: int = 1024,
+        json_output: bool = False,
+    ) -> str:
+        self.calls += 1
+        if self.calls <= self.stalls:
+            await asyncio.sleep(60)
+        return "ok"
+
+
+class TestRateLimiter:
+    def test_rate_limit_halves_and_success_recovers_concurrency(self) -> None:
+        """Concurrency drops multiplicatively on 429s and grows back additively."""
+        limiter = RateLimiter(RateLimits(), max_concurrency=8)
+
+        limiter.record_rate_limited()
+        assert limiter.concurrency == 4.0
+
+        for _ in range(4):
+            limiter.record_success()
+        assert 4.0 < limiter.concurrency <= 5.0
+
+    async def test_request_window_blocks_until_oldest_request_expires(self) -> None:
+        """Requests beyond the per-minute budget wait for the window to slide."""
+        now = [0.0]
+        limiter = RateLimiter(
+            RateLimits(requests_per_minute=1), max_concurrency=4, clock=lambda: now[0]
+        )
+
+        async with limiter.acquire():
+            pass
+
+        assert limiter._reserve(0) == 60.0
+        now[0] = 60.0
+        assert limiter._reserve(0) == 0.0
+
+
+class TestRateLimitedProvider:
+    async def test_retries_after_rate_limit(self) -> None:
+        """A rate-limited request is retried and succeeds."""
+        provider = FlakyProvider(failures=2)
+        limiter = RateLimiter(RateLimits(), max_concurrency=4)
+        limited = RateLimitedProvider(provider, limiter, backoff_seconds=0)
+
+        assert await limited.generate("prompt") == "ok"
+        assert provider.calls == 3
+        assert limiter.concurrency < 4
+
+    async def test_gives_up_after_max_retries(self) -> None:
+        """Persistent rate limiting surfaces after the retry budget is spent."""
+        provider = FlakyProvider(failures=10)
+        limited = RateLimitedProvider(
+            provider, RateLimiter(RateLimits(), max_concurrency=4), backoff_seconds=0
+        )
+
+        with pytest.raises(RateLimitError):
+            await limited.generate("prompt")
+        assert provider.calls == 4
+
+    async def test_retries_after_timeout(self) -> None:
+        """A stalled request is abandoned at the timeout and retried."""
+        provider = StallingProvider(stalls=1)
+        limiter = RateLimiter(RateLimits(), max_concurrency=4)
+        limited = RateLimitedProvider(provider, limiter, request_timeout=0.05)
+
+        assert await limited.generate("prompt") == "ok"
+        assert provider.calls == 2
+        assert limiter.concurrency == 4
+
+    async def test_timeout_surfaces_after_max_retries(self) -> None:
+        """Requests that keep stalling fail once the retry budget is spent."""
+        provider = StallingProvider(stalls=10)
+        limited = RateLimitedProvider(
+            provider,
+            RateLimiter(RateLimits(), max_concurrency=4),
+            max_retries=1,
+            request_timeout=0.05,
+        )
+
+        with pytest.raises(TimeoutError):
+            await limited.generate("prompt")
+        assert provider.calls == 2
+
+    async def test_provider_timeout_surfaces_without_a_limit(self) -> None:
+        """A provider's own timeout is re-raised as-is when no request timeout is set."""
+
+        class TimingOutProvider(StallingProvider):
+            async def generate(self, prompt: str, **kwargs: object) -> str:
+                self.calls += 1
+                raise TimeoutError("read timed out")
+
+        provider = TimingOutProvider(stalls=0)
+        limited = RateLimitedProvider(
+            provider, RateLimiter(RateLimits(), max_concurrency=4), max_retries=1
+        )
+
+        with pytest.raises(TimeoutError, match="read timed out"):
+            await limited.generate("prompt")
+        assert provider.calls == 2
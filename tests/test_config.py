@@ -69,6 +69,27 @@ class TestConfigLoading:
         with pytest.raises(ValueError, match="token"):
             load_config(config_file)
 
+    def test_missing_credentials_fall_back_to_environment(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Credentials left out of the file are read from environment variables."""
+        monkeypatch.setenv("PLEX_TOKEN", "env-plex-token")
+        monkeypatch.setenv("OPENAI_API_KEY", "env-openai-key")
+        monkeypatch.setenv("VERCEL_TOKEN", "env-vercel-token")
+        config_data = {
+            "plex": {"url": "https://plex.example.com"},
+            "llm": {"provider": "openai"},
+            "hosting": {"provider": "vercel", "vercel": {"project_name": "my-wrapped"}},
+        }
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump(config_data))
+
+        config = load_config(config_file)
+
+        assert config.plex.token == "env-plex-token"
+        assert config.llm.api_key == "env-openai-key"
+        assert config.hosting.vercel.token == "env-vercel-token"
+
 
 class TestLLMConfig:
     def test_llm_provider_none_skips_api_key(self, tmp_path: Path) -> None:
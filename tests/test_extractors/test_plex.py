@@ -20,6 +20,13 @@ class TestPlexExtractor:
         assert extractor.url == "https://plex.example.com"
         assert extractor.token == "test-token"
 
+    def test_music_library_requires_connection(self) -> None:
+        """The music library is only available once connect() has found it."""
+        extractor = PlexExtractor(url="https://plex.example.com", token="test-token")
+
+        with pytest.raises(RuntimeError, match="Not connected"):
+            extractor.music_library
+
     def test_track_model(self) -> None:
         """Track model holds listening data."""
         track = Track(
@@ -59,3 +66,41 @@ class TestPlexExtractor:
         )
         assert history.total_tracks == 2
         assert history.total_minutes == 7.0
+
+    def test_listening_history_round_trips_tracks(self) -> None:
+        """Tracks survive a JSON round trip through ListeningHistory."""
+        track = Track(
+            title="Song 1",
+            artist="Artist 1",
+            album="Album 1",
+            duration_ms=180000,
+            played_at=datetime(2024, 1, 1, 12, 0),
+            user="testuser",
+        )
+        history = ListeningHistory(user="testuser", year=2024, tracks=[track])
+
+        restored = ListeningHistory(**history.model_dump(mode="json"))
+
+        assert restored.tracks == [track]
+
+    def test_listening_history_columns(self) -> None:
+        """Columns expose each track field as a parallel sequence."""
+        history = ListeningHistory(
+            user="testuser",
+            year=2024,
+            tracks=[
+                Track(
+                    title=f"Song {i}",
+                    artist="Artist",
+                    album="Album",
+                    duration_ms=60000 * i,
+                    played_at=datetime(2024, 1, i, 12, 0),
+                    user="testuser",
+                )
+                for i in (1, 2)
+            ],
+        )
+
+        assert history.columns.title == ["Song 1", "Song 2"]
+        assert list(history.columns.duration_ms) == [60000, 120000]
+        assert history.total_minutes == 3.0
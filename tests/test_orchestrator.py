@@ -1,6 +1,8 @@
 # ABOUTME: Tests for CLI orchestration.
 # ABOUTME: Verifies end-to-end workflow from extract to deploy.
 
+import json
+
 import pytest
 from pathlib import Path
 
@@ -26,3 +28,162 @@ class TestOrchestrator:
 
         assert orchestrator.config == config
         assert orchestrator.output_dir == tmp_path
+
+    def test_plex_extractor_shares_orchestrator_session(self, tmp_path: Path) -> None:
+        """Every Plex extractor the orchestrator creates reuses its HTTP session."""
+        config = Config(
+            plex=PlexConfig(url="https://test.com", token="test"),
+            llm=LLMConfig(provider="none"),
+            year=2024,
+            hosting=HostingConfig(provider="none"),
+            output_dir=tmp_path,
+        )
+
+        orchestrator = Orchestrator(config)
+
+        first, second = orchestrator._plex_extractor(), orchestrator._plex_extractor()
+        assert first.session is second.session is orchestrator.session
+
+    async def test_generate_ai_content_fills_every_user(self, tmp_path: Path) -> None:
+        """AI generation runs every generator for every user and stores the results."""
+        from plex_wrapped.ai.provider import LLMProvider
+
+        class EchoProvider(LLMProvider):
+            async def generate(
+                self,
+                prompt: str,
+                system: str | None = None,
+                max_tokens: int = 1024,
+                json_output: bool = False,
+            ) -> str:
+                return '{"narrative": {"narrative": "hi"}}'
+
+        config = Config(
+            plex=PlexConfig(url="https://test.com", token="test"),
+            llm=LLMConfig(provider="none", max_concurrency=2),
+            year=2024,
+            hosting=HostingConfig(provider="none"),
+            output_dir=tmp_path,
+        )
+        orchestrator = Orchestrator(config)
+        processed = [("alice", "2024", {"user": "alice"}), ("bob", "2024", {"user": "bob"})]
+
+        await orchestrator._generate_ai_content(EchoProvider(), processed)
+
+        for _, _, stats in processed:
+            assert len(stats["ai_content"]) == 8
+            assert stats["ai_content"]["narrative"] == {"narrative": "hi"}
+
+    def test_process_writes_stats_for_every_user(self, tmp_path: Path) -> None:
+        """Processing fans out across users and writes one processed file each."""
+        from datetime import datetime
+
+        from plex_wrapped.extractors.plex import ListeningHistory, Track
+
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        for username in ("alice", "bob"):
+            history = ListeningHistory(
+                user=username,
+                year=2024,
+                tracks=[
+                    Track(
+                        title="Song",
+                        artist="Artist",
+                        album="Album",
+                        duration_ms=180000,
+                        played_at=datetime(2024, 3, 1, 22, 0),
+                        user=username,
+                    )
+                ],
+            )
+            (data_dir / f"{username}_2024_raw.json").write_text(history.model_dump_json())
+
+        config = Config(
+            plex=PlexConfig(url="https://test.com", token="test"),
+            llm=LLMConfig(provider="none"),
+            year=2024,
+            hosting=HostingConfig(provider="none"),
+            output_dir=tmp_path,
+        )
+
+        Orchestrator(config).process()
+
+        for username in ("alice", "bob"):
+            processed = json.loads((data_dir / f"{username}_2024_processed.json").read_text())
+            assert processed["user"] == username
+            assert processed["total"]["total_tracks"] == 1
+
+    def test_run_command_streams_output_and_raises_on_failure(self, tmp_path: Path) -> None:
+        """Command output reaches the progress callback line by line; failures keep the tail."""
+        import subprocess
+        import sys
+
+        config = Config(
+            plex=PlexConfig(url="https://test.com", token="test"),
+            llm=LLMConfig(provider="none"),
+            year=2024,
+            hosting=HostingConfig(provider="none"),
+            output_dir=tmp_path,
+        )
+        orchestrator = Orchestrator(config)
+        lines: list[str] = []
+
+        orchestrator._run_command(
+            [sys.executable, "-c", "print('one'); print('two')"], on_progress=lines.append
+        )
+        assert lines == ["one", "two"]
+
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            orchestrator._run_command(
+                [sys.executable, "-c", "import sys; print('boom', file=sys.stderr); sys.exit(3)"]
+            )
+        assert exc_info.value.returncode == 3
+        assert "boom" in exc_info.value.output
+
+    async def test_download_images_saves_each_image_once(self, tmp_path: Path) -> None:
+        """Images are fetched concurrently, typed by content, and skipped once on disk."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        requests_seen: list[str] = []
+
+        class ImageHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                requests_seen.append(self.path)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.end_headers()
+                self.wfile.write(b"png-bytes")
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), ImageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        config = Config(
+            plex=PlexConfig(url=base, token="test"),
+            llm=LLMConfig(provider="none"),
+            year=2024,
+            hosting=HostingConfig(provider="none"),
+            output_dir=tmp_path,
+        )
+        orchestrator = Orchestrator(config)
+        images = [(f"{base}/thumb/{i}", f"artist-{i}", f"artist:{i}") for i in range(5)]
+
+        try:
+            key_to_local, downloaded, failed = await orchestrator._download_images(
+                images, tmp_path, "alice"
+            )
+            assert (downloaded, failed) == (5, 0)
+            assert all(path.endswith(".png") for path in key_to_local.values())
+            assert len(list(tmp_path.glob("artist-*.png"))) == 5
+
+            again = await orchestrator._download_images(images, tmp_path, "alice")
+            assert again == (key_to_local, 0, 0)
+            assert len(requests_seen) == 5
+        finally:
+            server.shutdown()
+            server.server_close()
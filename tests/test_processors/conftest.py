@@ -0,0 +1,52 @@
+# ABOUTME: Shared fixtures for processor tests.
+# ABOUTME: Builds one canonical listening history reused across the time analysis tests.
+
+from datetime import datetime
+
+import pytest
+
+from plex_wrapped.extractors.plex import ListeningHistory, Track
+from plex_wrapped.processors.time_analysis import TimeAnalysisProcessor
+
+
+def make_track_at(title: str, hour: int, day_of_week: int = 0, month: int = 1) -> Track:
+    """Create a track played at specific time."""
+    # day_of_week: 0=Monday, 6=Sunday
+    # Find a date in 2024 that matches the day_of_week
+    base_date = datetime(2024, month, 1)
+    days_ahead = day_of_week - base_date.weekday()
+    if days_ahead < 0:
+        days_ahead += 7
+    target_date = base_date.replace(day=base_date.day + days_ahead)
+
+    return Track(
+        title=title,
+        artist="Artist",
+        album="Album",
+        duration_ms=180000,
+        played_at=target_date.replace(hour=hour),
+        user="testuser",
+    )
+
+
+@pytest.fixture(scope="session")
+def canonical_history() -> ListeningHistory:
+    """History with known hour, weekday and late-night patterns.
+
+    - 5 plays of "Night Song" at 2am on Mondays
+    - 10 plays of "Evening Song" at 10pm on Wednesdays (the peak hour)
+    - 1 play of "Day Song" at 2pm on a Friday
+    """
+    tracks = [make_track_at("Night Song", hour=2, day_of_week=0, month=m) for m in range(1, 6)]
+    tracks += [make_track_at("Evening Song", hour=22, day_of_week=2) for _ in range(10)]
+    tracks += [make_track_at("Day Song", hour=14, day_of_week=4)]
+    return ListeningHistory(user="test", year=2024, tracks=tracks)
+
+
+@pytest.fixture(scope="session")
+def time_processor(canonical_history: ListeningHistory) -> TimeAnalysisProcessor:
+    """TimeAnalysisProcessor over the canonical history.
+
+    Shared across tests; its cached columns and counts never change once built.
+    """
+    return TimeAnalysisProcessor(canonical_history)
@@ -3,102 +3,98 @@
 
 import pytest
 
-from plex_wrapped.setup_tui import HostingScreen, ProcessingScreen, SetupApp, SummaryScreen
+from plex_wrapped.setup_tui import HostingScreen, ProcessingScreen, SummaryScreen
 
 
 class TestProcessingScreen:
     """Tests for the ProcessingScreen component."""
 
-    async def test_processing_screen_shows_stage_indicators(self):
+    async def test_processing_screen_shows_stage_indicators(self, setup_app):
         """ProcessingScreen displays extract, process, build, deploy stage indicators."""
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            # Push the processing screen and wait for it to mount
-            await app.push_screen(ProcessingScreen())
-            await pilot.pause()
-
-            # Should have stage indicators for each phase
-            extract_label = app.screen.query_one("#stage-extract")
-            process_label = app.screen.query_one("#stage-process")
-            build_label = app.screen.query_one("#stage-build")
-            deploy_label = app.screen.query_one("#stage-deploy")
-
-            assert extract_label is not None
-            assert process_label is not None
-            assert build_label is not None
-            assert deploy_label is not None
-
-    async def test_processing_screen_has_start_button(self):
+        app, pilot = setup_app
+        # Push the processing screen and wait for it to mount
+        await app.push_screen(ProcessingScreen())
+        await pilot.pause(0)
+
+        # Should have stage indicators for each phase
+        extract_label = app.screen.query_one("#stage-extract")
+        process_label = app.screen.query_one("#stage-process")
+        build_label = app.screen.query_one("#stage-build")
+        deploy_label = app.screen.query_one("#stage-deploy")
+
+        assert extract_label is not None
+        assert process_label is not None
+        assert build_label is not None
+        assert deploy_label is not None
+
+    async def test_processing_screen_has_start_button(self, setup_app):
         """ProcessingScreen has a Start button to begin generation."""
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            await app.push_screen(ProcessingScreen())
-            await pilot.pause()
+        app, pilot = setup_app
+        await app.push_screen(ProcessingScreen())
+        await pilot.pause(0)
 
-            start_button = app.screen.query_one("#start-generation")
-            assert start_button is not None
-            assert not start_button.disabled
+        start_button = app.screen.query_one("#start-generation")
+        assert start_button is not None
+        assert not start_button.disabled
 
-    async def test_processing_screen_has_log_output_area(self):
+    async def test_processing_screen_has_log_output_area(self, setup_app):
         """ProcessingScreen has a log output area for status messages."""
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            await app.push_screen(ProcessingScreen())
-            await pilot.pause()
+        app, pilot = setup_app
+        await app.push_screen(ProcessingScreen())
+        await pilot.pause(0)
 
-            log_area = app.screen.query_one("#log-output")
-            assert log_area is not None
+        log_area = app.screen.query_one("#log-output")
+        assert log_area is not None
 
 
 class TestSummaryScreen:
     """Tests for the SummaryScreen component."""
 
-    async def test_summary_screen_has_generate_button(self):
+    async def test_summary_screen_has_generate_button(self, setup_app):
         """SummaryScreen has a Generate button to start the pipeline."""
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            await app.push_screen(SummaryScreen())
-            await pilot.pause()
+        app, pilot = setup_app
+        await app.push_screen(SummaryScreen())
+        await pilot.pause(0)
 
-            generate_button = app.screen.query_one("#generate")
-            assert generate_button is not None
+        generate_button = app.screen.query_one("#generate")
+        assert generate_button is not None
 
-    async def test_generate_button_disabled_initially(self):
+    async def test_generate_button_disabled_initially(self, setup_app):
         """Generate button is disabled until config is saved."""
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            await app.push_screen(SummaryScreen())
-            await pilot.pause()
+        app, pilot = setup_app
+        await app.push_screen(SummaryScreen())
+        await pilot.pause(0)
 
-            generate_button = app.screen.query_one("#generate")
-            assert generate_button.disabled is True
+        generate_button = app.screen.query_one("#generate")
+        assert generate_button.disabled is True
 
-    async def test_generate_button_navigates_to_processing_screen(self):
+    async def test_generate_button_navigates_to_processing_screen(self, setup_app):
         """Clicking Generate navigates to ProcessingScreen."""
         from textual.widgets import Button
 
-        app = SetupApp()
-        async with app.run_test() as pilot:
-            await app.push_screen(SummaryScreen())
-            await pilot.pause()
+        app, pilot = setup_app
+        await app.push_screen(SummaryScreen())
+        await pilot.pause(0)
 
-            # Enable the button manually for testing navigation
-            generate_button = app.screen.query_one("#generate", Button)
-            generate_button.disabled = False
+        # Enable the button manually for testing navigation
+        generate_button = app.screen.query_one("#generate", Button)
+        generate_button.disabled = False
 
-            # Press the button directly
-            generate_button.press()
-            await pilot.pause()
+        # Press the button directly
+        generate_button.press()
+        await pilot.pause()
 
-            # Should now be on ProcessingScreen
-            assert isinstance(app.screen, ProcessingScreen)
+        # Should now be on ProcessingScreen
+        assert isinstance(app.screen, ProcessingScreen)
 
-    async def test_generate_button_enabled_after_save(self):
+    async def test_generate_button_enabled_after_save(self, setup_app, monkeypatch):
         """Generate button should be enabled after config is saved."""
-        from unittest.mock import patch
         from textual.widgets import Button
 
-        app = SetupApp()
+        app, pilot = setup_app
+        # Capture the write instead of touching the filesystem
+        written = []
+        monkeypatch.setattr(app, "config_writer", lambda path, data: written.append(path))
         # Pre-populate config data so save works
         app.config_data = {
             "plex": {"url": "http://test:32400", "token": "test_token"},
@@ -106,33 +102,77 @@ class TestSummaryScreen:
             "hosting": {"provider": "cloudflare", "cloudflare": {}},
         }
 
-        async with app.run_test() as pilot:
-            await app.push_screen(SummaryScreen())
-            await pilot.pause()
+        await app.push_screen(SummaryScreen())
+        await pilot.pause(0)
 
-            # Generate button should be disabled initially
-            generate_button = app.screen.query_one("#generate", Button)
-            assert generate_button.disabled is True
+        # Generate button should be disabled initially
+        generate_button = app.screen.query_one("#generate", Button)
+        assert generate_button.disabled is True
 
-            # Mock the file write to avoid actual I/O
-            with patch("builtins.open"):
-                # Press save button
-                save_button = app.screen.query_one("#save", Button)
-                save_button.press()
-                await pilot.pause()
+        save_button = app.screen.query_one("#save", Button)
+        save_button.press()
+        await pilot.pause()
 
-            # Generate button should now be enabled
-            assert generate_button.disabled is False
+        # Generate button should now be enabled
+        assert generate_button.disabled is False
+        assert [path.name for path in written] == ["config.yaml"]
+
+    async def test_save_disabled_while_year_is_invalid(self, setup_app):
+        """Save is only available while the year input holds a valid year."""
+        from textual.widgets import Button, Input
+
+        app, pilot = setup_app
+        await app.push_screen(SummaryScreen())
+        await pilot.pause(0)
+
+        year_input = app.screen.query_one("#year", Input)
+        save_button = app.screen.query_one("#save", Button)
+
+        year_input.value = "twenty"
+        await pilot.pause()
+        assert save_button.disabled is True
+
+        year_input.value = "2024"
+        await pilot.pause()
+        assert save_button.disabled is False
+
+    def test_short_secrets_are_fully_masked(self):
+        """Secrets too short to spare four characters aren't partially revealed."""
+        from plex_wrapped.setup_tui import _mask_secret
+
+        assert _mask_secret("sk-abcdef123456") == "********...3456"
+        assert _mask_secret("abc") == "********..."
+
+    async def test_summary_is_rebuilt_when_config_changes(self, setup_app):
+        """A cached summary is reused until the config it was built from changes."""
+        from rich.console import Console
+
+        app, pilot = setup_app
+        app.config_data = {"plex": {"url": "http://first:32400", "token": "abcd1234"}}
+
+        screen = SummaryScreen()
+        await app.push_screen(screen)
+        await pilot.pause(0)
+
+        first = screen.build_summary()
+        assert screen.build_summary() is first
+
+        app.config_data["plex"]["url"] = "http://second:32400"
+        console = Console(width=80)
+        with console.capture() as capture:
+            console.print(screen.build_summary())
+        assert "http://second:32400" in capture.get()
+        assert "abcd1234" not in capture.get()
 
 
 class TestHostingScreen:
     """Tests for the HostingScreen config pre-fill."""
 
-    async def test_hosting_screen_prefills_cloudflare_from_config(self):
+    async def test_hosting_screen_prefills_cloudflare_from_config(self, setup_app):
         """HostingScreen pre-fills Cloudflare fields from existing config."""
         from textual.widgets import Input, RadioButton, RadioSet
 
-        app = SetupApp()
+        app, pilot = setup_app
         app.config_data = {
             "hosting": {
                 "provider": "cloudflare",
@@ -143,27 +183,26 @@ class TestHostingScreen:
             }
         }
 
-        async with app.run_test() as pilot:
-            await app.push_screen(HostingScreen())
-            await pilot.pause()
+        await app.push_screen(HostingScreen())
+        await pilot.pause(0)
 
-            # Check provider is selected
-            provider_set = app.screen.query_one("#provider-set", RadioSet)
-            cloudflare_button = app.screen.query_one("#cloudflare", RadioButton)
-            assert cloudflare_button.value is True
+        # Check provider is selected
+        provider_set = app.screen.query_one("#provider-set", RadioSet)
+        cloudflare_button = app.screen.query_one("#cloudflare", RadioButton)
+        assert cloudflare_button.value is True
 
-            # Check fields are pre-filled
-            account_id = app.screen.query_one("#account-id", Input)
-            project_name = app.screen.query_one("#project-name", Input)
+        # Check fields are pre-filled
+        account_id = app.screen.query_one("#account-id", Input)
+        project_name = app.screen.query_one("#project-name", Input)
 
-            assert account_id.value == "test_account_id"
-            assert project_name.value == "test_project"
+        assert account_id.value == "test_account_id"
+        assert project_name.value == "test_project"
 
-    async def test_hosting_screen_prefills_vercel_from_config(self):
+    async def test_hosting_screen_prefills_vercel_from_config(self, setup_app):
         """HostingScreen pre-fills Vercel fields from existing config."""
         from textual.widgets import Input, RadioButton
 
-        app = SetupApp()
+        app, pilot = setup_app
         app.config_data = {
             "hosting": {
                 "provider": "vercel",
@@ -174,17 +213,151 @@ class TestHostingScreen:
             }
         }
 
-        async with app.run_test() as pilot:
-            await app.push_screen(HostingScreen())
-            await pilot.pause()
+        await app.push_screen(HostingScreen())
+        await pilot.pause(0)
+
+        # Check provider is selected
+        vercel_button = app.screen.query_one("#vercel", RadioButton)
+        assert vercel_button.value is True
+
+        # Check fields are pre-filled
+        token = app.screen.query_one("#token", Input)
+        project_name = app.screen.query_one("#project-name", Input)
+
+        assert token.value == "vercel_token_123"
+        assert project_name.value == "my_vercel_project"
+
+
+class TestPlexScreen:
+    """Tests for the PlexScreen component."""
+
+    async def test_missing_credentials_show_error(self, setup_app):
+        """Testing without a URL or token reports it in the status line."""
+        app, pilot = setup_app
+        await app.push_screen("plex")
+        await pilot.pause(0)
+
+        app.screen.test_connection()
+        await pilot.pause()
+
+        assert "Please enter both URL and token" in str(app.screen._last_status)
+
+
+class TestLLMScreen:
+    """Tests for the LLMScreen component."""
+
+    async def test_missing_sdk_reports_failure(self, setup_app, monkeypatch):
+        """A provider SDK that can't be imported is reported instead of hanging."""
+        from textual.widgets import Button
+
+        from plex_wrapped import setup_tui
+
+        def missing(name):
+            raise ImportError(f"No module named {name!r}")
+
+        monkeypatch.setattr(setup_tui.importlib, "import_module", missing)
+        app, pilot = setup_app
+        await app.push_screen("llm")
+        await pilot.pause(0)
+
+        await app.screen.test_llm_key("openai", "sk-test").wait()
+        await pilot.pause()
+
+        assert "package isn't installed" in str(app.screen._last_status)
+        assert app.screen.query_one("#next", Button).disabled is True
+
+
+class TestValidationCache:
+    """Tests for remembering successful credential checks."""
+
+    def test_cached_validation_expires(self, monkeypatch):
+        """A remembered check is returned until its TTL runs out."""
+        from plex_wrapped import setup_tui
+
+        key = setup_tui._credentials_key("plex", "https://plex.test", "token")
+        setup_tui._cache_validation(key, ["alice"])
+
+        assert setup_tui._get_cached_validation(key) == ["alice"]
+        assert "token" not in key
+
+        monkeypatch.setattr(setup_tui, "VALIDATION_TTL_SECONDS", -1.0)
+        setup_tui._cache_validation(key, ["alice"])
+
+        assert setup_tui._get_cached_validation(key) is None
+
+    def test_validation_marker_persists_until_expiry(self, monkeypatch, tmp_path):
+        """Successful checks are recorded on disk for later sessions, then expire."""
+        from plex_wrapped import setup_tui
+
+        monkeypatch.setattr(setup_tui, "VALIDATION_MARKERS_PATH", tmp_path / "validated.json")
+        key = setup_tui._credentials_key("llm", "anthropic", "sk-test")
+
+        assert setup_tui._is_marked_validated(key) is False
+        setup_tui._mark_validated(key)
+        assert setup_tui._is_marked_validated(key) is True
+        assert "sk-test" not in (tmp_path / "validated.json").read_text()
+
+        monkeypatch.setattr(setup_tui, "VALIDATION_MARKER_TTL_SECONDS", -1.0)
+        setup_tui._mark_validated(key)
+        assert setup_tui._is_marked_validated(key) is False
+
+    async def test_previously_validated_plex_config_enables_next(
+        self, monkeypatch, tmp_path, setup_app
+    ):
+        """Reopening the wizard with already-verified Plex credentials skips the test."""
+        from textual.widgets import Button
+
+        from plex_wrapped import setup_tui
+
+        monkeypatch.setattr(setup_tui, "VALIDATION_MARKERS_PATH", tmp_path / "validated.json")
+        setup_tui._mark_validated(setup_tui._credentials_key("plex", "http://plex:32400", "tok"))
+
+        app, pilot = setup_app
+        app.config_data = {"plex": {"url": "http://plex:32400", "token": "tok"}}
+        await app.push_screen("plex")
+        await pilot.pause(0)
+
+        assert app.screen.query_one("#next", Button).disabled is False
+
+
+class TestHostingScreenFields:
+    """Tests for swapping provider fields on HostingScreen."""
+
+    async def test_rapid_provider_changes_show_last_selection(self, setup_app):
+        """Stepping through providers settles on the fields of the last one selected."""
+        from textual.widgets import RadioButton
+
+        app, pilot = setup_app
+        app.config_data = {}
+
+        await app.push_screen(HostingScreen())
+        await pilot.pause(0)
+
+        app.screen.query_one("#vercel", RadioButton).value = True
+        app.screen.query_one("#netlify", RadioButton).value = True
+        await pilot.pause(HostingScreen.FIELD_UPDATE_DELAY * 2)
+        await pilot.pause()
+
+        assert set(app.screen._fields) == {"token", "site-id"}
+        assert "vercel" not in app.screen._field_groups
+
+    async def test_switching_providers_keeps_typed_values(self, setup_app):
+        """Fields of a provider switched away from keep their values when switched back."""
+        app, pilot = setup_app
+        app.config_data = {}
+
+        await app.push_screen(HostingScreen())
+        await pilot.pause(0)
+        screen = app.screen
+
+        screen._fields["project-name"].value = "my-site"
+        screen.update_fields("github")
+        await pilot.pause()
 
-            # Check provider is selected
-            vercel_button = app.screen.query_one("#vercel", RadioButton)
-            assert vercel_button.value is True
+        assert not screen._field_groups["cloudflare"].display
+        assert screen._field_groups["github"].display
 
-            # Check fields are pre-filled
-            token = app.screen.query_one("#token", Input)
-            project_name = app.screen.query_one("#project-name", Input)
+        screen.update_fields("cloudflare")
+        await pilot.pause()
 
-            assert token.value == "vercel_token_123"
-            assert project_name.value == "my_vercel_project"
+        assert screen._fields["project-name"].value == "my-site"